@@ -1,12 +1,53 @@
-from flask import Flask, render_template, request, jsonify
-import joblib
+from flask import Flask, render_template, request, jsonify, send_file, url_for
+import os
+import time
+import dataclasses
 import pandas as pd
 import numpy as np
+from src.components.drift_monitor import DriftMonitor
+from src.pipeline.batch_pipeline import BatchScoringService
+from src.pipeline.predict_pipeline import PredictPipeline
+from src.pipeline.assignment_pipeline import TechnicianAssignmentOptimizer
+from src.pipeline.forecast_pipeline import FleetForecaster, ForecastConfig
+from src.components.feature_store import FeatureStore
+from src.components.model_registry import LiveModel
+from src.pipeline.shadow_pipeline import ShadowEvaluator
+from src.config import PREDICTION_LOG_SAMPLE_RATE
+from src.logger import get_logger, logging_stats
+
+logger = get_logger(__name__)
 
 app = Flask(__name__)
 
-# Load the model
-model = joblib.load('models/maintenance_model.joblib')
+# Load the active model version; newly activated versions are loaded,
+# warmed up and swapped in by a background thread without a restart
+live_model = LiveModel()
+live_model.get()
+live_model.start()
+
+# Streaming drift summaries of prediction traffic (updated outside the
+# timed prediction, so primary and shadow latencies cover the same work)
+drift_monitor = DriftMonitor()
+predict_pipeline = PredictPipeline(live_model=live_model)
+
+# Candidate model scored on sampled requests by a background worker
+shadow_evaluator = ShadowEvaluator(live_model)
+shadow_evaluator.start()
+
+# Asynchronous batch scoring, run in separate worker processes
+batch_service = BatchScoringService()
+batch_service.start()
+
+# Precomputed per-machine features for predict-by-ID
+feature_store = FeatureStore()
+feature_store.load()
+machine_pipeline = PredictPipeline(live_model=live_model)
+
+# Job-to-technician planning with the cost model
+assignment_optimizer = TechnicianAssignmentOptimizer(machine_pipeline)
+
+# Multi-horizon fleet cost projections with the cost model
+fleet_forecaster = FleetForecaster(machine_pipeline)
 
 @app.route('/')
 def home():
@@ -35,13 +76,213 @@ def predict():
         df_input = pd.DataFrame(data)
         
         # Predict
-        prediction = model.predict(df_input)[0]
+        with shadow_evaluator.track():
+            start = time.perf_counter()
+            predictions = predict_pipeline.predict(df_input)
+            latency = time.perf_counter() - start
+        drift_monitor.update(df_input, predictions)
+        shadow_evaluator.submit(df_input, predictions, latency)
+        prediction = predictions[0]
+        
+        # Sampled structured record; the log writer runs off the request thread
+        logger.info("prediction", extra={
+            'sample_rate': PREDICTION_LOG_SAMPLE_RATE,
+            'model_version': live_model.current[0],
+            'features': {col: values[0] for col, values in data.items()},
+            'prediction': float(prediction),
+            'latency_ms': round(latency * 1000, 3)
+        })
         
         return render_template('index.html', 
                                prediction_text=f'Estimated Maintenance Cost: ${prediction:.2f}',
                                form_data=request.form)
     except Exception as e:
+        logger.error(f"Error in /predict: {str(e)}")
         return render_template('index.html', error_text=f'Error: {str(e)}')
 
+@app.route('/model', methods=['GET'])
+def model_info():
+    """
+    Returns the model version currently being served and its metadata.
+    """
+    version = live_model.get()[0]
+    metadata = live_model.registry.metadata(version) if version else {}
+    return jsonify({'version': version or 'fallback', 'metadata': metadata})
+
+@app.route('/shadow', methods=['GET'])
+def shadow():
+    """
+    Returns rolling comparisons between the served and the candidate model.
+    """
+    return jsonify(shadow_evaluator.report())
+
+@app.route('/logging', methods=['GET'])
+def logging_info():
+    """
+    Returns counters of the non-blocking log writer (dropped and sampled-out records).
+    """
+    return jsonify(logging_stats())
+
+@app.route('/drift', methods=['GET'])
+def drift():
+    """
+    Returns drift statistics of live traffic against the training profile.
+    """
+    return jsonify(drift_monitor.report())
+
+def _predict_machines(machine_ids):
+    """Look up machines in the feature store and score the ones found"""
+    # Rows must come from the served version's preprocessor: the current
+    # snapshot (with upserts) once it belongs to that version, otherwise,
+    # while another version is being swapped in, the version's own snapshot
+    version, model, _ = live_model.get()
+    feature_store.load()
+    snapshot = None
+    if version is not None and feature_store.model_version != version:
+        snapshot = live_model.registry.metadata(version).get('feature_store_snapshot')
+    features, found = feature_store.lookup(machine_ids, snapshot)
+    predictions = model.predict(features) if len(features) else []
+    found_ids = [m for m, ok in zip(machine_ids, found) if ok]
+    missing_ids = [m for m, ok in zip(machine_ids, found) if not ok]
+    return dict(zip(found_ids, (float(p) for p in predictions))), missing_ids
+
+@app.route('/predict/machine/<machine_id>', methods=['GET'])
+def predict_machine(machine_id):
+    """
+    Predicts the maintenance cost of a known machine from its stored features.
+    """
+    try:
+        predictions, _ = _predict_machines([machine_id])
+        if machine_id not in predictions:
+            return jsonify({'error': f'Unknown machine: {machine_id}'}), 404
+        return jsonify({'machine_id': machine_id, 'prediction': predictions[machine_id]})
+    except FileNotFoundError as e:
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/predict/machines', methods=['POST'])
+def predict_machines():
+    """
+    Predicts maintenance costs for a JSON list of machine IDs,
+    e.g. {"machine_ids": ["M_0001", "M_0002"]}.
+    """
+    try:
+        payload = request.get_json(silent=True) or {}
+        machine_ids = payload.get('machine_ids') if isinstance(payload, dict) else payload
+        if not isinstance(machine_ids, list):
+            return jsonify({'error': 'Expected {"machine_ids": [...]}'}), 400
+        predictions, missing = _predict_machines([str(m) for m in machine_ids])
+        return jsonify({'predictions': predictions, 'missing': missing})
+    except FileNotFoundError as e:
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/assign', methods=['POST'])
+def assign_technicians():
+    """
+    Assigns pending jobs to technicians with minimal total predicted cost.
+    Expects {"jobs": [...job features...], "technicians": [{"Technician_ID",
+    "Technician_Experience", "Capacity"}, ...]}.
+    """
+    try:
+        payload = request.get_json(silent=True) or {}
+        jobs = pd.DataFrame.from_records(payload.get('jobs') or [])
+        technicians = pd.DataFrame.from_records(payload.get('technicians') or [])
+        if jobs.empty or technicians.empty:
+            return jsonify({'error': 'Expected non-empty "jobs" and "technicians" lists'}), 400
+        
+        assignments, summary = assignment_optimizer.assign(jobs, technicians)
+        assignments = assignments.astype(object).where(assignments.notna(), None)
+        return jsonify({'assignments': assignments.to_dict(orient='records'),
+                        'summary': summary})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/forecast', methods=['POST'])
+def forecast_fleet():
+    """
+    Projects maintenance cost per machine over future horizons.
+    Expects {"machines": [...machine features...]} and optionally "horizons",
+    "usage_hours_per_day", "usage_rate_multiplier", "service_interval_days"
+    and "group_by" (e.g. "Maintenance_Type").
+    """
+    try:
+        payload = request.get_json(silent=True) or {}
+        machines = pd.DataFrame.from_records(payload.get('machines') or [])
+        if machines.empty:
+            return jsonify({'error': 'Expected a non-empty "machines" list'}), 400
+        
+        assumptions = {key: payload[key] for key in
+                       ('horizons', 'usage_hours_per_day', 'usage_rate_multiplier',
+                        'service_interval_days') if key in payload}
+        if 'horizons' in assumptions:
+            assumptions['horizons'] = tuple(assumptions['horizons'])
+        forecaster = FleetForecaster(machine_pipeline,
+                                     dataclasses.replace(fleet_forecaster.config, **assumptions))
+        
+        forecast = forecaster.forecast(machines)
+        summary = forecaster.aggregate(forecast, by=payload.get('group_by'))
+        return jsonify({'machines': forecast.to_dict(orient='records'),
+                        'summary': summary.to_dict(orient='records')})
+    except (KeyError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Submits a batch scoring job.
+    Accepts a CSV upload (form field 'file'), a CSV body, or a JSON list of
+    records, and returns the job ID to poll.
+    """
+    try:
+        if 'file' in request.files:
+            job_id = batch_service.submit_csv(request.files['file'].stream)
+        elif request.is_json:
+            payload = request.get_json()
+            records = payload.get('records') if isinstance(payload, dict) else payload
+            if not isinstance(records, list) or not records:
+                return jsonify({'error': 'Expected a non-empty list of records'}), 400
+            job_id = batch_service.submit_records(records)
+        elif request.content_length:
+            job_id = batch_service.submit_csv(request.stream)
+        else:
+            return jsonify({'error': 'No CSV or JSON payload provided'}), 400
+        
+        return jsonify({'job_id': job_id,
+                        'status_url': url_for('job_status', job_id=job_id),
+                        'result_url': url_for('job_result', job_id=job_id)}), 202
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """
+    Returns the status and progress of a batch scoring job.
+    """
+    status = batch_service.status(job_id)
+    if status is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(status)
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    """
+    Downloads the results CSV of a completed batch scoring job.
+    """
+    status = batch_service.status(job_id)
+    if status is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    result_path = batch_service.result_path(job_id)
+    if result_path is None:
+        return jsonify({'error': f"Job is {status['status']}"}), 409
+    return send_file(os.path.abspath(result_path), mimetype='text/csv',
+                     as_attachment=True, download_name=f'{job_id}.csv')
+
 if __name__ == "__main__":
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,350 @@
+"""
+Load-testing harness for the prediction service.
+
+Launches app.py under gunicorn, replays a realistic request mix built from
+generate_maintenance_data, and reports throughput, latency percentiles,
+error rate and per-worker CPU/RSS. With --sweep-workers/--sweep-threads it
+repeats the run for every server configuration over increasing concurrency
+and writes the saturation curve to CSV.
+
+Examples:
+    python load_test.py --workers 2 --threads 4 --concurrency 16 --duration 30
+    python load_test.py --mode open --rate 200 --duration 30
+    python load_test.py --sweep-workers 1,2,4 --sweep-threads 1,4 --sweep-concurrency 1,4,16,64
+"""
+import os
+import sys
+import csv
+import time
+import random
+import argparse
+import threading
+import subprocess
+import http.client
+import numpy as np
+from urllib.parse import urlencode
+from generate_data import generate_maintenance_data
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MIX = 'predict=90,home=5,drift=5'
+
+def build_requests(n_samples, mix):
+    """
+    Build a shuffled list of (method, path, body, headers) requests
+
+    Args:
+        n_samples: Number of synthetic machines to draw form inputs from
+        mix: Dict of endpoint name to relative weight
+
+    Returns:
+        list: Requests to replay in a round-robin fashion
+    """
+    df = generate_maintenance_data(n_samples)
+    form_headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+    forms = [
+        urlencode({
+            'age': f"{row.Age:.1f}",
+            'usage_hours': f"{row.Usage_Hours:.0f}",
+            'maintenance_type': row.Maintenance_Type,
+            'last_maintenance_days': int(row.Last_Maintenance_Days),
+            'part_replacement': int(row.Part_Replacement),
+            'technician_experience': f"{row.Technician_Experience:.1f}"
+        })
+        for row in df.itertuples()
+    ]
+
+    total = sum(mix.values())
+    requests = []
+    for i, form in enumerate(forms):
+        pick = (i * 7919 % total)  # deterministic spread of the mix
+        for name, weight in mix.items():
+            if pick < weight:
+                break
+            pick -= weight
+        if name == 'predict':
+            requests.append(('POST', '/predict', form, form_headers))
+        elif name == 'home':
+            requests.append(('GET', '/', None, {}))
+        else:
+            requests.append(('GET', f'/{name}', None, {}))
+
+    random.Random(42).shuffle(requests)
+    return requests
+
+class ServerProcess:
+    """A gunicorn server running app:app, plus /proc-based worker sampling"""
+
+    def __init__(self, workers, threads, port, app_dir=PROJECT_DIR):
+        self.workers = workers
+        self.threads = threads
+        self.port = port
+        self.app_dir = app_dir
+        self.process = None
+
+    def __enter__(self):
+        cmd = [sys.executable, '-m', 'gunicorn', '-w', str(self.workers),
+               '--threads', str(self.threads), '-b', f'127.0.0.1:{self.port}',
+               '--log-level', 'warning', 'app:app']
+        self.process = subprocess.Popen(cmd, cwd=self.app_dir)
+        self._wait_ready()
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+    def _wait_ready(self, timeout=60):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError("gunicorn exited during startup")
+            try:
+                conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=2)
+                conn.request('GET', '/')
+                if conn.getresponse().status == 200 and len(self.worker_pids()) >= self.workers:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError("gunicorn did not become ready in time")
+
+    def worker_pids(self):
+        """PIDs of the gunicorn worker processes (children of the master)"""
+        path = f'/proc/{self.process.pid}/task/{self.process.pid}/children'
+        try:
+            with open(path) as f:
+                return [int(pid) for pid in f.read().split()]
+        except OSError:
+            return []
+
+def sample_process(pid):
+    """
+    Read cumulative CPU seconds and current RSS of a process from /proc
+
+    Returns:
+        tuple: (cpu_seconds, rss_bytes), or None if unavailable
+    """
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        cpu = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+        with open(f'/proc/{pid}/statm') as f:
+            rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        return cpu, rss
+    except (OSError, IndexError, ValueError):
+        return None
+
+class LoadGenerator:
+    """Replays requests in closed-loop (fixed clients) or open-loop (fixed rate) mode"""
+
+    def __init__(self, port, requests, timeout=30):
+        self.port = port
+        self.requests = requests
+        self.timeout = timeout
+
+    def _send(self, conn, request):
+        method, path, body, headers = request
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        return response.status < 400
+
+    def _client(self, next_request, results, deadline):
+        conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=self.timeout)
+        latencies, errors = [], 0
+        while True:
+            item = next_request()
+            if item is None:
+                break
+            scheduled, request = item
+            if scheduled is not None:
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            start = scheduled if scheduled is not None else time.perf_counter()
+            if start > deadline:
+                break
+            try:
+                ok = self._send(conn, request)
+            except (OSError, http.client.HTTPException):
+                ok = False
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=self.timeout)
+            # Open loop measures from the scheduled time to avoid coordinated omission
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+        conn.close()
+        results.append((latencies, errors))
+
+    def run(self, duration, concurrency, mode='closed', rate=None):
+        """
+        Run one load test
+
+        Args:
+            duration: Seconds to generate load
+            concurrency: Client threads (closed loop) or sender pool size (open loop)
+            mode: 'closed' or 'open'
+            rate: Mean arrivals per second for open loop (Poisson process)
+
+        Returns:
+            dict: Throughput, latency percentiles and error rate
+        """
+        lock = threading.Lock()
+        counter = iter(range(sys.maxsize))
+        start = time.perf_counter()
+        deadline = start + duration
+
+        if mode == 'open':
+            if not rate:
+                raise ValueError("Open-loop mode needs --rate")
+            gaps = np.random.default_rng(42).exponential(1.0 / rate, int(rate * duration * 1.2) + 1)
+            arrivals = start + np.cumsum(gaps)
+            arrivals = arrivals[arrivals < deadline]
+
+            def next_request():
+                with lock:
+                    i = next(counter)
+                if i >= len(arrivals):
+                    return None
+                return arrivals[i], self.requests[i % len(self.requests)]
+        else:
+            def next_request():
+                with lock:
+                    i = next(counter)
+                if time.perf_counter() >= deadline:
+                    return None
+                return None, self.requests[i % len(self.requests)]
+
+        results = []
+        threads = [threading.Thread(target=self._client, args=(next_request, results, deadline))
+                   for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        latencies = np.array([l for lat, _ in results for l in lat]) * 1000
+        errors = sum(err for _, err in results)
+        count = len(latencies)
+        percentiles = (np.percentile(latencies, [50, 95, 99, 99.9]) if count
+                       else [float('nan')] * 4)
+
+        return {
+            'requests': count,
+            'throughput_rps': count / elapsed,
+            'p50_ms': percentiles[0],
+            'p95_ms': percentiles[1],
+            'p99_ms': percentiles[2],
+            'p999_ms': percentiles[3],
+            'error_rate': errors / count if count else 0.0
+        }
+
+def run_against_server(server, generator, args, concurrency):
+    """Run one measurement and attach per-worker CPU/RSS usage"""
+    pids = server.worker_pids()
+    before = {pid: sample_process(pid) for pid in pids}
+    result = generator.run(args.duration, concurrency, args.mode, args.rate)
+    elapsed = args.duration
+
+    workers = []
+    for pid in pids:
+        after = sample_process(pid)
+        if after is None or before.get(pid) is None:
+            continue
+        workers.append({
+            'pid': pid,
+            'cpu_percent': 100 * (after[0] - before[pid][0]) / elapsed,
+            'rss_mb': after[1] / 1024**2
+        })
+    result['workers'] = workers
+    return result
+
+def print_result(label, result):
+    print(f"{label}: {result['requests']} requests, {result['throughput_rps']:.1f} req/s, "
+          f"p50 {result['p50_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms, "
+          f"p99 {result['p99_ms']:.1f} ms, p99.9 {result['p999_ms']:.1f} ms, "
+          f"errors {result['error_rate']:.2%}")
+    for worker in result['workers']:
+        print(f"    worker {worker['pid']}: CPU {worker['cpu_percent']:.0f}%, "
+              f"RSS {worker['rss_mb']:.0f} MB")
+
+def parse_list(value):
+    return [int(v) for v in value.split(',') if v]
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, weight = part.split('=')
+        mix[name.strip()] = int(weight)
+    return mix
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the maintenance cost prediction service")
+    parser.add_argument('--workers', type=int, default=2, help="gunicorn worker processes")
+    parser.add_argument('--threads', type=int, default=1, help="threads per gunicorn worker")
+    parser.add_argument('--concurrency', type=int, default=8, help="client threads")
+    parser.add_argument('--duration', type=float, default=20, help="seconds per measurement")
+    parser.add_argument('--warmup', type=float, default=3, help="warm-up seconds before measuring")
+    parser.add_argument('--mode', choices=['closed', 'open'], default='closed')
+    parser.add_argument('--rate', type=float, help="open-loop arrival rate (req/s)")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help="endpoint weights, e.g. predict=90,drift=10")
+    parser.add_argument('--samples', type=int, default=2000, help="synthetic machines to draw inputs from")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--sweep-workers', type=parse_list, help="e.g. 1,2,4")
+    parser.add_argument('--sweep-threads', type=parse_list, help="e.g. 1,4")
+    parser.add_argument('--sweep-concurrency', type=parse_list, default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument('--output', default=os.path.join('reports', 'load_test', 'saturation.csv'))
+    args = parser.parse_args()
+
+    requests = build_requests(args.samples, parse_mix(args.mix))
+    generator = LoadGenerator(args.port, requests)
+
+    if not (args.sweep_workers or args.sweep_threads):
+        with ServerProcess(args.workers, args.threads, args.port) as server:
+            generator.run(args.warmup, args.concurrency)
+            result = run_against_server(server, generator, args, args.concurrency)
+        print_result(f"workers={args.workers} threads={args.threads} "
+                     f"{args.mode}-loop concurrency={args.concurrency}", result)
+        return
+
+    # Saturation sweep: every server configuration over increasing client concurrency
+    rows = []
+    for workers in args.sweep_workers or [args.workers]:
+        for threads in args.sweep_threads or [args.threads]:
+            with ServerProcess(workers, threads, args.port) as server:
+                generator.run(args.warmup, max(args.sweep_concurrency))
+                for concurrency in args.sweep_concurrency:
+                    result = run_against_server(server, generator, args, concurrency)
+                    print_result(f"workers={workers} threads={threads} concurrency={concurrency}",
+                                 result)
+                    rows.append({
+                        'workers': workers,
+                        'threads': threads,
+                        'concurrency': concurrency,
+                        **{k: v for k, v in result.items() if k != 'workers'},
+                        'cpu_percent': sum(w['cpu_percent'] for w in result['workers']),
+                        'rss_mb': sum(w['rss_mb'] for w in result['workers'])
+                    })
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"\nSaturation curve saved to {args.output}")
+
+    # Peak throughput per configuration, with the concurrency where it was reached
+    print("\nPeak throughput per configuration:")
+    for workers in args.sweep_workers or [args.workers]:
+        for threads in args.sweep_threads or [args.threads]:
+            config_rows = [r for r in rows if r['workers'] == workers and r['threads'] == threads]
+            best = max(config_rows, key=lambda r: r['throughput_rps'])
+            print(f"  workers={workers} threads={threads}: {best['throughput_rps']:.1f} req/s "
+                  f"at concurrency {best['concurrency']} (p99 {best['p99_ms']:.1f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -4,16 +4,57 @@ Handles loading and initial processing of maintenance data
 """
 import os
 import sys
+import glob
+import time
+import queue
+import threading
 import pandas as pd
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
+from src.config import ID_COLUMN, NUMERIC_FEATURES, CATEGORICAL_FEATURES, TARGET_COLUMN
+from src.utils import load_csv, format_memory_report
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Resolution of the hash split: a row goes to test when its bucket < test_size * buckets
+SPLIT_BUCKETS = 10000
+
+# Columns of the train and test files, in this order whatever the shard layout
+SCHEMA_COLUMNS = [ID_COLUMN] + NUMERIC_FEATURES + CATEGORICAL_FEATURES + [TARGET_COLUMN]
+
+# Marks the end of a shard's chunk queue
+_END_OF_SHARD = object()
 
 @dataclass
 class DataIngestionConfig:
     """Configuration for data ingestion"""
+    # A CSV file, a directory of CSV shards, or a glob such as 'data/exports/*.csv'
     raw_data_path: str = os.path.join('data', 'maintenance_data.csv')
     train_data_path: str = os.path.join('data', 'train.csv')
     test_data_path: str = os.path.join('data', 'test.csv')
+    test_size: float = 0.2
+    n_workers: int = field(default_factory=lambda: min(4, os.cpu_count() or 1))
+    # Rows parsed at a time; each worker holds at most queue_chunks split
+    # chunks that the writer has not consumed yet
+    chunk_rows: int = 250000
+    queue_chunks: int = 2
+
+def hash_split_mask(machine_ids, test_size):
+    """
+    Deterministically assign rows to the test set by hashing their Machine_ID
+    
+    Args:
+        machine_ids: Series of machine identifiers
+        test_size: Fraction of machines assigned to the test set
+    
+    Returns:
+        ndarray: Boolean mask, True for test rows
+    """
+    hashes = pd.util.hash_pandas_object(machine_ids.astype(str), index=False).to_numpy()
+    return (hashes % SPLIT_BUCKETS) < int(test_size * SPLIT_BUCKETS)
 
 class DataIngestion:
     """Handles data ingestion and initial split"""
@@ -21,34 +62,177 @@ class DataIngestion:
     def __init__(self):
         self.config = DataIngestionConfig()
     
+    def _resolve_shards(self):
+        """
+        Expand the configured source into an ordered list of shard files
+        
+        Returns:
+            list: Shard file paths
+        """
+        source = self.config.raw_data_path
+        
+        if os.path.isdir(source):
+            shards = sorted(glob.glob(os.path.join(source, '*.csv')))
+        elif glob.has_magic(source):
+            shards = sorted(glob.glob(source))
+        else:
+            shards = [source]
+        
+        # The train and test files may live in the source directory; never
+        # ingest a previous run's split as a shard
+        outputs = {os.path.abspath(self.config.train_data_path),
+                   os.path.abspath(self.config.test_data_path)}
+        shards = [shard for shard in shards if os.path.abspath(shard) not in outputs]
+        
+        if not shards:
+            raise FileNotFoundError(f"No CSV shards found for {source}")
+        
+        return shards
+    
+    def _ingest_shard(self, shard_path, chunk_queue, stop):
+        """
+        Stream one shard in chunks, handing each chunk's train and test rows
+        (as header-less CSV text) to the writer through a bounded queue
+        
+        Args:
+            shard_path: Path to the shard file
+            chunk_queue: Bounded queue read in shard order by the writer;
+                ends with _END_OF_SHARD
+            stop: Event set by the writer to abandon the shard
+        
+        Returns:
+            tuple: (rows, train rows, test rows, bytes, seconds, memory)
+                statistics, memory describing the first (largest) chunk
+        """
+        start = time.perf_counter()
+        rows = train_rows = test_rows = 0
+        memory = None
+        
+        def put(item):
+            # Block while the writer is behind, unless it gave up
+            while not stop.is_set():
+                try:
+                    chunk_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        try:
+            # Read only the schema columns, with compact dtypes
+            chunks = load_csv(shard_path, columns=SCHEMA_COLUMNS, chunksize=self.config.chunk_rows)
+            for chunk in chunks:
+                # usecols keeps the shard's own column order; align it to the schema
+                chunk = chunk[SCHEMA_COLUMNS]
+                is_test = hash_split_mask(chunk[ID_COLUMN], self.config.test_size)
+                if memory is None:
+                    memory = format_memory_report(f"Shard {os.path.basename(shard_path)} chunk", chunk)
+                rows += len(chunk)
+                test_rows += int(is_test.sum())
+                train_rows += int((~is_test).sum())
+                
+                if not put((chunk[~is_test].to_csv(index=False, header=False),
+                            chunk[is_test].to_csv(index=False, header=False))):
+                    break
+        finally:
+            put(_END_OF_SHARD)
+        
+        elapsed = time.perf_counter() - start
+        return rows, train_rows, test_rows, os.path.getsize(shard_path), elapsed, memory
+    
     def initiate_data_ingestion(self):
         """
         Load data and perform train-test split
         
+        Shards are parsed in parallel worker threads (the pandas CSV parser
+        releases the GIL), each streamed in chunks of chunk_rows through a
+        bounded queue; the calling thread writes the chunks to the train and
+        test files in shard order, so every row is written once and at most
+        queue_chunks chunks per worker are held in memory.
+        Columns are written in schema order whatever the order in a shard.
+        Rows are split by a hash of Machine_ID, so the split is reproducible
+        and a machine never lands in both sets.
+        
         Returns:
             tuple: Paths to train and test data
         """
         try:
-            print("Starting data ingestion...")
+            logger.info("Starting data ingestion...")
             
-            # Read the dataset
-            df = pd.read_csv(self.config.raw_data_path)
-            print(f"Loaded {len(df)} records from {self.config.raw_data_path}")
+            shards = self._resolve_shards()
+            n_workers = max(1, min(self.config.n_workers, len(shards)))
+            logger.info(f"Ingesting {len(shards)} shard(s) from {self.config.raw_data_path} "
+                        f"with {n_workers} worker(s)")
             
             # Create data directory if it doesn't exist
             os.makedirs(os.path.dirname(self.config.train_data_path), exist_ok=True)
             
-            # Perform train-test split (80-20)
-            from sklearn.model_selection import train_test_split
-            train_set, test_set = train_test_split(df, test_size=0.2, random_state=42)
+            # Write to temporary files so a failed run leaves the old split intact
+            train_tmp_path = self.config.train_data_path + '.tmp'
+            test_tmp_path = self.config.test_data_path + '.tmp'
+            
+            total_rows = total_bytes = train_rows = test_rows = 0
+            start = time.perf_counter()
+            
+            stop = threading.Event()
+            
+            def submit(index):
+                chunk_queue = queue.Queue(maxsize=self.config.queue_chunks)
+                future = executor.submit(self._ingest_shard, shards[index], chunk_queue, stop)
+                return shards[index], chunk_queue, future
+            
+            with ThreadPoolExecutor(max_workers=n_workers) as executor, \
+                    open(train_tmp_path, 'w', newline='') as train_file, \
+                    open(test_tmp_path, 'w', newline='') as test_file:
+                
+                header = pd.DataFrame(columns=SCHEMA_COLUMNS)
+                header.to_csv(train_file, index=False)
+                header.to_csv(test_file, index=False)
+                
+                # One shard in flight per worker, so the oldest shard is always
+                # running and its queue is the one being drained
+                pending = deque(submit(i) for i in range(n_workers))
+                next_index = len(pending)
+                
+                try:
+                    while pending:
+                        shard_path, chunk_queue, future = pending[0]
+                        for item in iter(chunk_queue.get, _END_OF_SHARD):
+                            train_file.write(item[0])
+                            test_file.write(item[1])
+                        rows, shard_train, shard_test, size, elapsed, memory = future.result()
+                        pending.popleft()
+                        
+                        if next_index < len(shards):
+                            pending.append(submit(next_index))
+                            next_index += 1
+                        
+                        total_rows += rows
+                        total_bytes += size
+                        train_rows += shard_train
+                        test_rows += shard_test
+                        
+                        rate = rows / elapsed if elapsed else float('inf')
+                        logger.info(f"Shard {os.path.basename(shard_path)}: {rows} records, "
+                                    f"{rate:,.0f} records/s, "
+                                    f"{size / 1024**2 / max(elapsed, 1e-9):.1f} MB/s")
+                        if memory is not None:
+                            logger.info(memory)
+                except BaseException:
+                    # Release workers blocked on a full queue before the pool joins them
+                    stop.set()
+                    raise
             
-            # Save train and test sets
-            train_set.to_csv(self.config.train_data_path, index=False, header=True)
-            test_set.to_csv(self.config.test_data_path, index=False, header=True)
+            os.replace(train_tmp_path, self.config.train_data_path)
+            os.replace(test_tmp_path, self.config.test_data_path)
             
-            print(f"Train set: {len(train_set)} records")
-            print(f"Test set: {len(test_set)} records")
-            print("Data ingestion completed successfully")
+            elapsed = time.perf_counter() - start
+            logger.info(f"Loaded {total_rows} records from {len(shards)} shard(s) in {elapsed:.2f}s "
+                        f"({total_rows / max(elapsed, 1e-9):,.0f} records/s, "
+                        f"{total_bytes / 1024**2 / max(elapsed, 1e-9):.1f} MB/s)")
+            logger.info(f"Train set: {train_rows} records")
+            logger.info(f"Test set: {test_rows} records")
+            logger.info("Data ingestion completed successfully")
             
             return (
                 self.config.train_data_path,
@@ -56,7 +240,10 @@ class DataIngestion:
             )
             
         except Exception as e:
-            print(f"Error during data ingestion: {str(e)}")
+            logger.error(f"Error during data ingestion: {str(e)}")
+            for leftover in glob.glob(glob.escape(self.config.train_data_path) + '.tmp*') + \
+                    glob.glob(glob.escape(self.config.test_data_path) + '.tmp*'):
+                os.remove(leftover)
             raise e
 
 if __name__ == "__main__":
@@ -7,15 +7,32 @@ import sys
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
+from scipy import sparse
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 import joblib
+from src.components.drift_monitor import build_reference_profile
+from src.components.feature_binning import BinnedFeatureCache
+from src.config import NUMERIC_FEATURES, CATEGORICAL_FEATURES, TARGET_COLUMN
+from src.utils import load_csv, format_memory_report
+from src.logger import get_logger
+
+logger = get_logger(__name__)
 
 @dataclass
 class DataTransformationConfig:
     """Configuration for data transformation"""
     preprocessor_obj_file_path: str = os.path.join('models', 'preprocessor.pkl')
+    reference_profile_file_path: str = os.path.join('models', 'reference_profile.pkl')
+    feature_dtype: type = np.float32
+    target_dtype: type = np.float64
+    # Output CSR instead of dense once the one-hot block makes the matrix
+    # sparser than this density
+    sparse_threshold: float = 0.3
+    # Also cache uint8-binned features (opt-in: sklearn's histogram trainers
+    # bin their input themselves, so the cache saves memory, not fit time)
+    bin_features: bool = False
 
 class DataTransformation:
     """Handles data transformation and preprocessing"""
@@ -31,24 +48,36 @@ class DataTransformation:
             ColumnTransformer: Preprocessing pipeline
         """
         try:
-            # Define feature columns
-            numeric_features = ['Age', 'Usage_Hours', 'Last_Maintenance_Days', 
-                              'Technician_Experience']
-            categorical_features = ['Maintenance_Type', 'Part_Replacement']
-            
             # Create preprocessing pipeline
             preprocessor = ColumnTransformer(
                 transformers=[
-                    ('num', StandardScaler(), numeric_features),
-                    ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_features)
-                ])
+                    ('num', StandardScaler(), NUMERIC_FEATURES),
+                    ('cat', OneHotEncoder(handle_unknown='ignore',
+                                          dtype=self.config.feature_dtype),
+                     CATEGORICAL_FEATURES)
+                ],
+                sparse_threshold=self.config.sparse_threshold)
             
             return preprocessor
             
         except Exception as e:
-            print(f"Error creating transformer: {str(e)}")
+            logger.error(f"Error creating transformer: {str(e)}")
             raise e
     
+    def _as_feature_matrix(self, arr):
+        """
+        Convert transformer output to the model input layout without extra copies
+        
+        Args:
+            arr: Dense array or sparse matrix from the preprocessor
+            
+        Returns:
+            C-contiguous dense array or CSR matrix of feature_dtype
+        """
+        if sparse.issparse(arr):
+            return arr.tocsr().astype(self.config.feature_dtype, copy=False)
+        return np.ascontiguousarray(arr, dtype=self.config.feature_dtype)
+    
     def initiate_data_transformation(self, train_path, test_path):
         """
         Apply transformations to train and test data
@@ -58,62 +87,86 @@ class DataTransformation:
             test_path: Path to test data
             
         Returns:
-            tuple: Transformed train and test arrays, preprocessor object
+            tuple: Train features, train target, test features, test target
+                and preprocessor path. Features are contiguous arrays (or CSR
+                matrices when sparse) and targets are 1-D arrays.
         """
         try:
-            print("Starting data transformation...")
+            logger.info("Starting data transformation...")
             
-            # Read train and test data
-            train_df = pd.read_csv(train_path)
-            test_df = pd.read_csv(test_path)
+            # Read train and test data (features and target only)
+            columns = NUMERIC_FEATURES + CATEGORICAL_FEATURES + [TARGET_COLUMN]
+            train_df = load_csv(train_path, columns=columns)
+            test_df = load_csv(test_path, columns=columns)
             
-            print(f"Train data shape: {train_df.shape}")
-            print(f"Test data shape: {test_df.shape}")
+            logger.info(f"Train data shape: {train_df.shape}")
+            logger.info(f"Test data shape: {test_df.shape}")
+            logger.info(format_memory_report("Data transformation (train)", train_df))
+            logger.info(format_memory_report("Data transformation (test)", test_df))
             
             # Get preprocessing object
             preprocessing_obj = self.get_data_transformer_object()
             
             # Define target column
-            target_column_name = "Maintenance_Cost"
-            drop_columns = [target_column_name, "Machine_ID"]
+            target_column_name = TARGET_COLUMN
             
             # Separate features and target
-            input_feature_train_df = train_df.drop(columns=drop_columns, axis=1)
+            input_feature_train_df = train_df.drop(columns=[target_column_name])
             target_feature_train_df = train_df[target_column_name]
             
-            input_feature_test_df = test_df.drop(columns=drop_columns, axis=1)
+            input_feature_test_df = test_df.drop(columns=[target_column_name])
             target_feature_test_df = test_df[target_column_name]
             
-            print("Applying preprocessing...")
+            logger.info("Applying preprocessing...")
             
             # Fit and transform training data
-            input_feature_train_arr = preprocessing_obj.fit_transform(input_feature_train_df)
-            input_feature_test_arr = preprocessing_obj.transform(input_feature_test_df)
+            X_train = self._as_feature_matrix(
+                preprocessing_obj.fit_transform(input_feature_train_df))
+            X_test = self._as_feature_matrix(
+                preprocessing_obj.transform(input_feature_test_df))
+            
+            # Keep the target separate so the feature matrix is never copied
+            y_train = target_feature_train_df.to_numpy(dtype=self.config.target_dtype)
+            y_test = target_feature_test_df.to_numpy(dtype=self.config.target_dtype)
             
-            # Combine features and target
-            train_arr = np.c_[
-                input_feature_train_arr, np.array(target_feature_train_df)
-            ]
-            test_arr = np.c_[
-                input_feature_test_arr, np.array(target_feature_test_df)
-            ]
+            layout = "sparse CSR" if sparse.issparse(X_train) else "dense"
+            logger.info(f"Feature matrix: {X_train.shape[1]} columns, {layout}, "
+                        f"{np.dtype(X_train.dtype).name}")
             
             # Save preprocessing object
             os.makedirs(os.path.dirname(self.config.preprocessor_obj_file_path), 
                        exist_ok=True)
             joblib.dump(preprocessing_obj, self.config.preprocessor_obj_file_path)
             
-            print(f"Preprocessor saved to {self.config.preprocessor_obj_file_path}")
-            print("Data transformation completed successfully")
+            logger.info(f"Preprocessor saved to {self.config.preprocessor_obj_file_path}")
+            
+            # Save training-time reference profile for drift monitoring
+            reference_profile = build_reference_profile(
+                train_df,
+                numeric_features=NUMERIC_FEATURES,
+                categorical_features=CATEGORICAL_FEATURES,
+                target_column=target_column_name
+            )
+            joblib.dump(reference_profile, self.config.reference_profile_file_path)
+            
+            logger.info(f"Reference profile saved to {self.config.reference_profile_file_path}")
+            
+            # Quantize once so histogram-based trainers can reuse the bins
+            if self.config.bin_features:
+                BinnedFeatureCache().build(X_train, X_test)
+            
+            logger.info("Data transformation completed successfully")
             
             return (
-                train_arr,
-                test_arr,
+                X_train,
+                y_train,
+                X_test,
+                y_test,
                 self.config.preprocessor_obj_file_path
             )
             
         except Exception as e:
-            print(f"Error during data transformation: {str(e)}")
+            logger.error(f"Error during data transformation: {str(e)}")
             raise e
 
 if __name__ == "__main__":
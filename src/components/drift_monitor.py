@@ -0,0 +1,359 @@
+"""
+Drift Monitor Component
+Keeps streaming summaries of prediction traffic and compares them
+against the reference profile captured at training time
+"""
+import os
+import math
+import time
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+import numpy as np
+import joblib
+
+@dataclass
+class DriftMonitorConfig:
+    """Configuration for drift monitoring"""
+    reference_profile_path: str = os.path.join('models', 'reference_profile.pkl')
+    n_bins: int = 10
+    min_samples: int = 100
+    psi_warning: float = 0.1
+    psi_alert: float = 0.25
+    # Fixed number of traffic shards; threads are spread over them by id
+    n_shards: int = 16
+    # Seconds between checks for a new reference profile (retrain or activation)
+    reload_interval: float = 5.0
+
+def _category_key(value):
+    """Normalise a category value so 0, 0.0 and '0' share one bucket"""
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        value = int(value)
+    return str(value)
+
+def _numeric_reference(values, n_bins):
+    """
+    Summarise one numeric column for the reference profile
+
+    Args:
+        values: 1-D array of training values
+        n_bins: Number of quantile bins
+
+    Returns:
+        dict: Bin edges, bin fractions and moments
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+    edges = np.unique(np.quantile(values, quantiles))
+    counts = np.bincount(np.searchsorted(edges, values, side='right'),
+                         minlength=len(edges) + 1)
+
+    return {
+        'edges': edges.tolist(),
+        'fractions': (counts / max(len(values), 1)).tolist(),
+        'mean': float(values.mean()),
+        'std': float(values.std()),
+        'count': int(len(values))
+    }
+
+def build_reference_profile(df, numeric_features, categorical_features,
+                            target_column, n_bins=10):
+    """
+    Build the training-time reference profile used for drift comparisons
+
+    Args:
+        df: Training DataFrame
+        numeric_features: Numeric feature names
+        categorical_features: Categorical feature names
+        target_column: Target column, used as the reference for predictions
+        n_bins: Number of quantile bins per numeric feature
+
+    Returns:
+        dict: Reference profile
+    """
+    profile = {'numeric': {}, 'categorical': {}, 'prediction': None}
+
+    for feature in numeric_features:
+        profile['numeric'][feature] = _numeric_reference(df[feature], n_bins)
+
+    for feature in categorical_features:
+        counts = {}
+        for value, count in df[feature].value_counts().items():
+            key = _category_key(value)
+            counts[key] = counts.get(key, 0) + int(count)
+        total = sum(counts.values())
+        profile['categorical'][feature] = {
+            'fractions': {key: count / total for key, count in counts.items()}
+        }
+
+    if target_column in df.columns:
+        profile['prediction'] = _numeric_reference(df[target_column], n_bins)
+
+    return profile
+
+class StreamingStats:
+    """Welford mean/variance plus a fixed-bin histogram for one variable"""
+
+    __slots__ = ('edges', 'count', 'mean', 'm2', 'bins')
+
+    def __init__(self, edges):
+        self.edges = edges
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.bins = [0] * (len(edges) + 1)
+
+    def update(self, value):
+        """Add a single observation in O(1) (histogram edges are fixed and small)"""
+        if value != value:  # NaN
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.bins[bisect_right(self.edges, value)] += 1
+
+    def update_many(self, values):
+        """Add a batch of observations using the parallel Welford merge"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        batch = StreamingStats(self.edges)
+        batch.count = len(values)
+        batch.mean = float(values.mean())
+        batch.m2 = float(((values - batch.mean) ** 2).sum())
+        batch.bins = np.bincount(np.searchsorted(self.edges, values, side='right'),
+                                 minlength=len(self.bins)).tolist()
+        self.merge(batch)
+
+    def merge(self, other):
+        """Fold another summary into this one (Chan et al. combination)"""
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.bins = [a + b for a, b in zip(self.bins, other.bins)]
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else 0.0
+
+class _TrafficShard:
+    """Summaries for the threads mapped to one shard, so they rarely contend on its lock"""
+
+    def __init__(self, profile):
+        self.lock = threading.Lock()
+        self.numeric = {
+            feature: StreamingStats(ref['edges'])
+            for feature, ref in profile['numeric'].items()
+        }
+        self.categorical = {feature: {} for feature in profile['categorical']}
+        self.prediction = (StreamingStats(profile['prediction']['edges'])
+                           if profile['prediction'] else None)
+
+def population_stability_index(expected, actual, epsilon=1e-4):
+    """
+    Compute the PSI between two aligned lists of bucket fractions
+
+    Args:
+        expected: Reference fractions
+        actual: Observed fractions
+        epsilon: Floor applied to empty buckets
+
+    Returns:
+        float: PSI value
+    """
+    psi = 0.0
+    for e, a in zip(expected, actual):
+        e = max(e, epsilon)
+        a = max(a, epsilon)
+        psi += (a - e) * math.log(a / e)
+    return psi
+
+class DriftMonitor:
+    """Streams feature and prediction summaries and reports drift against training"""
+
+    def __init__(self, config=None):
+        self.config = config or DriftMonitorConfig()
+        # (profile, shards), swapped as one reference so readers see a matching pair
+        self._state = (None, [])
+        self._profile_signature = None
+        self._next_check = 0.0
+        self._reload_lock = threading.Lock()
+        self.load_reference()
+
+    @property
+    def profile(self):
+        return self._state[0]
+
+    def _signature(self):
+        try:
+            stat = os.stat(self.config.reference_profile_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def load_reference(self):
+        """
+        Load the reference profile saved by DataTransformation (or published
+        by a registry activation) if it changed since the last load
+
+        Live summaries are reset on a reload, since they are binned on the
+        previous profile's edges.
+
+        Returns:
+            bool: True if a profile is available
+        """
+        with self._reload_lock:
+            self._next_check = time.monotonic() + self.config.reload_interval
+            signature = self._signature()
+            if signature is not None and signature != self._profile_signature:
+                profile = joblib.load(self.config.reference_profile_path)
+                shards = [_TrafficShard(profile) for _ in range(self.config.n_shards)]
+                self._state = (profile, shards)
+                self._profile_signature = signature
+        return self.profile is not None
+
+    def _maybe_reload(self):
+        if time.monotonic() >= self._next_check:
+            self.load_reference()
+
+    def update(self, features, predictions=None):
+        """
+        Record a request's inputs and outputs
+
+        Args:
+            features: DataFrame of raw input features
+            predictions: Optional array of model predictions
+        """
+        self._maybe_reload()
+        _, shards = self._state
+        if not shards:
+            return
+        # Native thread ids are small and sequential, so they spread evenly
+        shard = shards[threading.get_native_id() % len(shards)]
+        with shard.lock:
+            self._update_shard(shard, features, predictions)
+
+    def _update_shard(self, shard, features, predictions):
+        single_row = len(features) == 1
+
+        for feature, stats in shard.numeric.items():
+            if feature not in features:
+                continue
+            if single_row:
+                stats.update(float(features[feature].iloc[0]))
+            else:
+                stats.update_many(features[feature].to_numpy())
+
+        for feature, counts in shard.categorical.items():
+            if feature not in features:
+                continue
+            for value in features[feature]:
+                key = _category_key(value)
+                counts[key] = counts.get(key, 0) + 1
+
+        if predictions is not None and shard.prediction is not None:
+            if len(predictions) == 1:
+                shard.prediction.update(float(predictions[0]))
+            else:
+                shard.prediction.update_many(predictions)
+
+    def _merged(self, profile, shards):
+        """Merge all shards into one summary (readers only)"""
+        merged = _TrafficShard(profile)
+        for shard in shards:
+            with shard.lock:
+                for feature, stats in shard.numeric.items():
+                    merged.numeric[feature].merge(stats)
+                for feature, counts in shard.categorical.items():
+                    target = merged.categorical[feature]
+                    for key, count in counts.items():
+                        target[key] = target.get(key, 0) + count
+                if merged.prediction is not None:
+                    merged.prediction.merge(shard.prediction)
+        return merged
+
+    def _status(self, psi, count):
+        if count < self.config.min_samples:
+            return 'insufficient_data'
+        if psi >= self.config.psi_alert:
+            return 'alert'
+        if psi >= self.config.psi_warning:
+            return 'warning'
+        return 'ok'
+
+    def _numeric_report(self, reference, stats):
+        actual = [b / stats.count for b in stats.bins] if stats.count else [0.0] * len(stats.bins)
+        psi = population_stability_index(reference['fractions'], actual)
+        mean_shift = ((stats.mean - reference['mean']) / reference['std']
+                      if reference['std'] else 0.0)
+        return {
+            'count': stats.count,
+            'mean': stats.mean,
+            'std': math.sqrt(stats.variance),
+            'reference_mean': reference['mean'],
+            'reference_std': reference['std'],
+            'mean_shift_std': mean_shift,
+            'psi': psi,
+            'status': self._status(psi, stats.count)
+        }
+
+    def report(self):
+        """
+        Compare the live summaries against the reference profile
+
+        Returns:
+            dict: Per-feature and prediction drift statistics
+        """
+        if not self.load_reference():
+            return {'status': 'no_reference_profile',
+                    'reference_profile_path': self.config.reference_profile_path}
+
+        profile, shards = self._state
+        merged = self._merged(profile, shards)
+        report = {'features': {}, 'prediction': None}
+
+        for feature, reference in profile['numeric'].items():
+            report['features'][feature] = self._numeric_report(reference,
+                                                               merged.numeric[feature])
+
+        for feature, reference in profile['categorical'].items():
+            counts = merged.categorical[feature]
+            total = sum(counts.values())
+            keys = sorted(set(reference['fractions']) | set(counts))
+            expected = [reference['fractions'].get(key, 0.0) for key in keys]
+            actual = [counts.get(key, 0) / total if total else 0.0 for key in keys]
+            psi = population_stability_index(expected, actual)
+            report['features'][feature] = {
+                'count': total,
+                'counts': dict(counts),
+                'unseen_categories': sorted(set(counts) - set(reference['fractions'])),
+                'psi': psi,
+                'status': self._status(psi, total)
+            }
+
+        if merged.prediction is not None:
+            report['prediction'] = self._numeric_report(profile['prediction'],
+                                                        merged.prediction)
+
+        statuses = [entry['status'] for entry in report['features'].values()]
+        if report['prediction']:
+            statuses.append(report['prediction']['status'])
+        for status in ('alert', 'warning', 'ok', 'insufficient_data'):
+            if status in statuses:
+                report['status'] = status
+                break
+        else:
+            report['status'] = 'insufficient_data'
+
+        return report
+
+if __name__ == "__main__":
+    monitor = DriftMonitor()
+    print(monitor.report())
@@ -0,0 +1,201 @@
+"""
+Feature Binning Component
+Quantizes transformed features into compact uint8 bins, cached next to the preprocessor
+"""
+import os
+import time
+import hashlib
+import numpy as np
+import joblib
+from dataclasses import dataclass
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+@dataclass
+class FeatureBinningConfig:
+    """Configuration for the binned feature cache"""
+    cache_file_path: str = os.path.join('models', 'binned_features.pkl')
+    # At most 256 bins, so every bin index fits in a uint8
+    max_bins: int = 255
+    # Rows sampled to find the bin thresholds
+    subsample: int = 200000
+    # Rows binned per block, bounding the dense temporaries for sparse input
+    block_rows: int = 65536
+
+class FeatureBinner(BaseEstimator, TransformerMixin):
+    """
+    Maps each feature column to uint8 bin indices
+
+    Columns with at most max_bins distinct values get one bin per value
+    (one-hot columns stay 0/1); other columns are split at quantiles of a
+    row sample, so every bin holds about the same number of rows.
+    """
+
+    def __init__(self, max_bins=255, subsample=200000, block_rows=65536, random_state=0):
+        self.max_bins = max_bins
+        self.subsample = subsample
+        self.block_rows = block_rows
+        self.random_state = random_state
+
+    def fit(self, X, y=None):
+        """
+        Find the bin thresholds of every column
+
+        Args:
+            X: Dense array or sparse matrix of transformed features
+
+        Returns:
+            FeatureBinner: self
+        """
+        if not 2 <= self.max_bins <= 256:
+            raise ValueError("max_bins must be between 2 and 256")
+        n_rows = X.shape[0]
+        if n_rows > self.subsample:
+            rng = np.random.default_rng(self.random_state)
+            rows = np.sort(rng.choice(n_rows, self.subsample, replace=False))
+            X = X[rows]
+        sample = X.toarray() if sparse.issparse(X) else np.asarray(X)
+
+        self.bin_thresholds_ = []
+        for j in range(sample.shape[1]):
+            column = sample[:, j][~np.isnan(sample[:, j])]
+            values = np.unique(column)
+            if len(values) <= self.max_bins:
+                thresholds = (values[:-1] + values[1:]) / 2
+            else:
+                quantiles = np.linspace(0, 100, self.max_bins + 1)[1:-1]
+                thresholds = np.unique(np.percentile(column, quantiles))
+            self.bin_thresholds_.append(thresholds.astype(np.float64))
+        self.n_features_in_ = sample.shape[1]
+        return self
+
+    def transform(self, X):
+        """
+        Args:
+            X: Dense array or sparse matrix of transformed features
+
+        Returns:
+            ndarray: C-contiguous uint8 bin indices of the same shape
+        """
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected {self.n_features_in_} features, got {X.shape[1]}")
+        binned = np.empty(X.shape, dtype=np.uint8)
+        for start in range(0, X.shape[0], self.block_rows):
+            block = X[start:start + self.block_rows]
+            block = block.toarray() if sparse.issparse(block) else np.asarray(block)
+            for j, thresholds in enumerate(self.bin_thresholds_):
+                binned[start:start + len(block), j] = np.searchsorted(
+                    thresholds, block[:, j], side='right')
+        return binned
+
+def data_fingerprint(*matrices, **params):
+    """
+    SHA-256 of the contents of dense arrays or sparse matrices and parameters
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256(repr(sorted(params.items())).encode())
+    for matrix in matrices:
+        digest.update(repr((type(matrix).__name__, matrix.shape, str(matrix.dtype))).encode())
+        if sparse.issparse(matrix):
+            matrix = matrix.tocsr()
+            parts = (matrix.data, matrix.indices, matrix.indptr)
+        else:
+            parts = (matrix,)
+        for part in parts:
+            digest.update(memoryview(np.ascontiguousarray(part)).cast('B'))
+    return digest.hexdigest()
+
+class BinnedFeatureCache:
+    """
+    Binned copies of the train and test features, stored once per dataset
+
+    The cache records a fingerprint of the float features it was built
+    from; load() only returns it for the same features, so repeated
+    trainings on one transformation output skip the binning step.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or FeatureBinningConfig()
+
+    def _fingerprint(self, X_train, X_test):
+        return data_fingerprint(X_train, X_test, max_bins=self.config.max_bins,
+                                subsample=self.config.subsample)
+
+    def load(self, X_train, X_test):
+        """
+        Load the cache if it was built from these features
+
+        Args:
+            X_train: Transformed training features
+            X_test: Transformed test features
+
+        Returns:
+            tuple: Binned train features, binned test features and the fitted
+                FeatureBinner, or None if there is no matching cache
+        """
+        return self._load(self._fingerprint(X_train, X_test))
+
+    def _load(self, fingerprint):
+        if not os.path.exists(self.config.cache_file_path):
+            return None
+        # Arrays are memory-mapped rather than read into memory
+        cache = joblib.load(self.config.cache_file_path, mmap_mode='r')
+        if cache['fingerprint'] != fingerprint:
+            return None
+        return cache['X_train'], cache['X_test'], cache['binner']
+
+    def build(self, X_train, X_test):
+        """
+        Bin the features and save the cache, unless a matching one exists
+
+        Args:
+            X_train: Transformed training features
+            X_test: Transformed test features
+
+        Returns:
+            tuple: Binned train features, binned test features and the fitted
+                FeatureBinner
+        """
+        try:
+            fingerprint = self._fingerprint(X_train, X_test)
+            cached = self._load(fingerprint)
+            if cached is not None:
+                logger.info(f"Binned features up to date in {self.config.cache_file_path}")
+                return cached
+
+            start = time.perf_counter()
+            binner = FeatureBinner(max_bins=self.config.max_bins,
+                                   subsample=self.config.subsample,
+                                   block_rows=self.config.block_rows)
+            X_train_binned = binner.fit(X_train).transform(X_train)
+            X_test_binned = binner.transform(X_test)
+            elapsed = time.perf_counter() - start
+
+            cache = {
+                'fingerprint': fingerprint,
+                'binner': binner,
+                'X_train': X_train_binned,
+                'X_test': X_test_binned
+            }
+            os.makedirs(os.path.dirname(self.config.cache_file_path) or '.', exist_ok=True)
+            tmp_cache_path = self.config.cache_file_path + '.tmp'
+            joblib.dump(cache, tmp_cache_path)
+            os.replace(tmp_cache_path, self.config.cache_file_path)
+
+            float_bytes = (X_train.data.nbytes if sparse.issparse(X_train) else X_train.nbytes)
+            logger.info(f"Binned {X_train.shape[1]} features into at most "
+                        f"{self.config.max_bins} bins in {elapsed:.2f}s "
+                        f"(train {X_train_binned.nbytes / 1024**2:.1f} MB uint8 vs "
+                        f"{float_bytes / 1024**2:.1f} MB float)")
+            logger.info(f"Binned features saved to {self.config.cache_file_path}")
+
+            return X_train_binned, X_test_binned, binner
+
+        except Exception as e:
+            logger.error(f"Error building binned features: {str(e)}")
+            raise e
@@ -0,0 +1,375 @@
+"""
+Feature Store Component
+Per-machine index of precomputed transformed features, keyed by Machine_ID
+"""
+import os
+import sys
+import time
+import shutil
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from scipy import sparse
+from src.config import ID_COLUMN, NUMERIC_FEATURES, CATEGORICAL_FEATURES
+from src.utils import load_csv, load_object
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+@dataclass
+class FeatureStoreConfig:
+    """Configuration for the feature store"""
+    store_dir: str = os.path.join('models', 'feature_store')
+    # Number of superseded snapshots to keep next to the current one
+    # (snapshots pinned by a registered model version are kept until
+    # ModelRegistry.prune releases them)
+    keep_snapshots: int = 2
+
+class FeatureStore:
+    """
+    Sorted, memory-mapped index from Machine_ID to a transformed feature row
+
+    Each snapshot is a directory holding ids.npy (sorted fixed-width byte
+    strings) and features.npy (float32 rows in the same order). Lookups are
+    a binary search over the memory-mapped ids, so only the touched pages
+    are read. Writers build a new snapshot and then swap the CURRENT
+    pointer with os.replace, so readers never see a half-written store.
+    Snapshots built for a model version are pinned instead: they only
+    become CURRENT when that version is activated.
+
+    The current snapshot records the model version whose preprocessor
+    produced it (MODEL_VERSION). Upserted raw rows are also kept in a
+    journal (upserts.csv, last row per machine), and activating a version
+    replays the journal onto its pinned snapshot, so upserts survive
+    retrains and rollbacks.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or FeatureStoreConfig()
+        self.ids = None
+        self.features = None
+        self.snapshot = None
+        self.model_version = None
+        # Memory-mapped (ids, features) of snapshots looked up by name
+        self._opened = {}
+
+    @property
+    def _pointer_path(self):
+        return os.path.join(self.config.store_dir, 'CURRENT')
+
+    @property
+    def _journal_path(self):
+        return os.path.join(self.config.store_dir, 'upserts.csv')
+
+    def _snapshot_version(self, snapshot):
+        try:
+            with open(os.path.join(self.config.store_dir, snapshot, 'MODEL_VERSION')) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _current_snapshot(self):
+        try:
+            with open(self._pointer_path) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _open(self, snapshot):
+        """Memory-map a snapshot's ids and features"""
+        snapshot_dir = os.path.join(self.config.store_dir, snapshot)
+        ids = np.load(os.path.join(snapshot_dir, 'ids.npy'), mmap_mode='r')
+        features = np.load(os.path.join(snapshot_dir, 'features.npy'), mmap_mode='r')
+        return ids, features
+
+    def load(self):
+        """
+        Memory-map the current snapshot if it changed since the last load
+
+        Returns:
+            bool: True if a snapshot is available
+        """
+        snapshot = self._current_snapshot()
+        if snapshot is None:
+            return False
+        if snapshot != self.snapshot:
+            ids, features = self._open(snapshot)
+            model_version = self._snapshot_version(snapshot)
+            # Publish both arrays together so readers see a consistent pair
+            self.ids, self.features, self.snapshot = ids, features, snapshot
+            self.model_version = model_version
+        return True
+
+    def __len__(self):
+        return 0 if self.ids is None else len(self.ids)
+
+    def lookup(self, machine_ids, snapshot=None):
+        """
+        Fetch transformed feature rows for a list of machines
+
+        Args:
+            machine_ids: Iterable of Machine_ID strings
+            snapshot: Snapshot to read (e.g. the one of the served model
+                version); defaults to the loaded current snapshot
+
+        Returns:
+            tuple: Feature matrix of the found machines, and a boolean mask
+                over machine_ids marking which were found
+        """
+        if snapshot is not None:
+            if snapshot not in self._opened:
+                self._opened[snapshot] = self._open(snapshot)
+            ids, features = self._opened[snapshot]
+        elif self.ids is None and not self.load():
+            raise FileNotFoundError(f"No feature store found in {self.config.store_dir}")
+        else:
+            ids, features = self.ids, self.features
+        encoded = [str(m).encode() for m in machine_ids]
+        if len(ids) == 0:
+            return features[:0], np.zeros(len(encoded), dtype=bool)
+
+        # Keys wider than the stored ids cannot match (and must not be truncated)
+        fits = np.array([len(key) <= ids.dtype.itemsize for key in encoded], dtype=bool)
+        keys = np.asarray([key if ok else b'' for key, ok in zip(encoded, fits)],
+                          dtype=ids.dtype)
+        positions = np.minimum(np.searchsorted(ids, keys), len(ids) - 1)
+        found = (ids[positions] == keys) & fits
+
+        return np.asarray(features[positions[found]]), found
+
+    def _transform(self, df, preprocessor):
+        """Transform raw rows into dense float32 feature rows, one per machine"""
+        df = df.drop_duplicates(subset=ID_COLUMN, keep='last')
+        matrix = preprocessor.transform(df[NUMERIC_FEATURES + CATEGORICAL_FEATURES])
+        if sparse.issparse(matrix):
+            matrix = matrix.toarray()
+        ids = df[ID_COLUMN].astype(str).to_numpy().astype(np.bytes_)
+        return ids, np.ascontiguousarray(matrix, dtype=np.float32)
+
+    def _merge(self, ids, features, new_ids, new_features):
+        """
+        Overlay new rows on sorted snapshot arrays
+
+        Returns:
+            tuple: Merged ids and features (unsorted), and the number of
+                updated and inserted machines
+        """
+        width = max(ids.dtype.itemsize, new_ids.dtype.itemsize)
+        ids = np.asarray(ids).astype(f'S{width}')
+        new_ids = new_ids.astype(f'S{width}')
+
+        if len(ids):
+            positions = np.minimum(np.searchsorted(ids, new_ids), len(ids) - 1)
+            existing = ids[positions] == new_ids
+        else:
+            positions = np.zeros(len(new_ids), dtype=np.int64)
+            existing = np.zeros(len(new_ids), dtype=bool)
+
+        features = np.array(features)
+        features[positions[existing]] = new_features[existing]
+
+        merged_ids = np.concatenate([ids, new_ids[~existing]])
+        merged_features = np.concatenate([features, new_features[~existing]])
+        return merged_ids, merged_features, int(existing.sum()), int((~existing).sum())
+
+    def _write_snapshot(self, ids, features, publish=True, model_version=None):
+        """
+        Persist sorted arrays as a new snapshot
+
+        Args:
+            ids: Machine IDs
+            features: Feature rows in the same order
+            publish: Make the snapshot current; otherwise it is pinned and
+                left for ModelRegistry.activate to publish
+            model_version: Model version whose preprocessor built the rows
+
+        Returns:
+            str: Snapshot name
+        """
+        order = np.argsort(ids, kind='stable')
+        ids, features = ids[order], features[order]
+
+        snapshot = f"{time.strftime('%Y%m%d_%H%M%S')}_{time.perf_counter_ns() % 10**9:09d}"
+        snapshot_dir = os.path.join(self.config.store_dir, snapshot)
+        os.makedirs(snapshot_dir, exist_ok=True)
+        np.save(os.path.join(snapshot_dir, 'ids.npy'), ids)
+        np.save(os.path.join(snapshot_dir, 'features.npy'), features)
+        if model_version:
+            with open(os.path.join(snapshot_dir, 'MODEL_VERSION'), 'w') as f:
+                f.write(model_version)
+
+        if publish:
+            self.publish(snapshot)
+        else:
+            open(os.path.join(snapshot_dir, 'PINNED'), 'w').close()
+        return snapshot
+
+    def publish(self, snapshot):
+        """
+        Atomically make an existing snapshot the current one
+
+        Args:
+            snapshot: Snapshot name
+        """
+        if not os.path.isdir(os.path.join(self.config.store_dir, snapshot)):
+            raise FileNotFoundError(f"Unknown feature store snapshot: {snapshot}")
+        pointer_tmp = self._pointer_path + f'.{os.getpid()}.tmp'
+        with open(pointer_tmp, 'w') as f:
+            f.write(snapshot)
+        os.replace(pointer_tmp, self._pointer_path)
+
+        self._prune_snapshots(keep=snapshot)
+        self.load()
+
+    def publish_version(self, snapshot, model_version, preprocessor_path):
+        """
+        Make a model version's pinned snapshot current, with every journaled
+        upsert replayed onto it
+
+        Args:
+            snapshot: Pinned snapshot built with the version's preprocessor
+            model_version: Version being activated
+            preprocessor_path: The version's preprocessor, used for the replay
+
+        Returns:
+            str: The published snapshot
+        """
+        journal = self._read_journal()
+        if journal is None or journal.empty:
+            with open(os.path.join(self.config.store_dir, snapshot, 'MODEL_VERSION'), 'w') as f:
+                f.write(model_version)
+            self.publish(snapshot)
+            return snapshot
+
+        ids, features = self._open(snapshot)
+        new_ids, new_features = self._transform(journal, load_object(preprocessor_path))
+        merged_ids, merged_features, _, _ = self._merge(ids, features, new_ids, new_features)
+        published = self._write_snapshot(merged_ids, merged_features, model_version=model_version)
+        logger.info(f"Replayed {len(journal)} upserted machine(s) onto snapshot {snapshot} "
+                    f"for model version {model_version}")
+        return published
+
+    def _read_journal(self):
+        if not os.path.exists(self._journal_path):
+            return None
+        return load_csv(self._journal_path,
+                        columns=[ID_COLUMN] + NUMERIC_FEATURES + CATEGORICAL_FEATURES)
+
+    def _append_journal(self, df):
+        """Record upserted raw rows, keeping the last row per machine"""
+        rows = df[[ID_COLUMN] + NUMERIC_FEATURES + CATEGORICAL_FEATURES]
+        journal = self._read_journal()
+        if journal is not None:
+            rows = pd.concat([journal.astype(object), rows.astype(object)], ignore_index=True)
+        rows = rows.drop_duplicates(subset=ID_COLUMN, keep='last')
+        journal_tmp = self._journal_path + f'.{os.getpid()}.tmp'
+        rows.to_csv(journal_tmp, index=False)
+        os.replace(journal_tmp, self._journal_path)
+
+    def _prune_snapshots(self, keep):
+        snapshots = sorted(name for name in os.listdir(self.config.store_dir)
+                           if os.path.isdir(os.path.join(self.config.store_dir, name)))
+        stale = [name for name in snapshots if name != keep and not
+                 os.path.exists(os.path.join(self.config.store_dir, name, 'PINNED'))]
+        for name in stale[:max(0, len(stale) - self.config.keep_snapshots)]:
+            shutil.rmtree(os.path.join(self.config.store_dir, name), ignore_errors=True)
+
+    def release_pinned(self, keep):
+        """
+        Unpin the snapshots no registered model version uses any more and
+        prune them like superseded snapshots
+
+        Args:
+            keep: Snapshot names still referenced by registry versions
+
+        Returns:
+            list: Released snapshot names
+        """
+        released = []
+        for name in sorted(os.listdir(self.config.store_dir)):
+            marker = os.path.join(self.config.store_dir, name, 'PINNED')
+            if name not in keep and os.path.exists(marker):
+                os.remove(marker)
+                released.append(name)
+        self._prune_snapshots(keep=self._current_snapshot())
+        return released
+
+    def build(self, df, preprocessor, publish=True):
+        """
+        Build a new snapshot from ingested records
+
+        Args:
+            df: DataFrame with Machine_ID and the raw feature columns; for
+                machines listed more than once the last row wins
+            preprocessor: Fitted preprocessor from DataTransformation
+            publish: Replace the current snapshot; with False the snapshot is
+                pinned for a model version and published on its activation
+
+        Returns:
+            tuple: Number of machines in the snapshot and the snapshot name
+        """
+        try:
+            os.makedirs(self.config.store_dir, exist_ok=True)
+            ids, features = self._transform(df, preprocessor)
+            snapshot = self._write_snapshot(ids, features, publish=publish)
+            return len(ids), snapshot
+
+        except Exception as e:
+            logger.error(f"Error building feature store: {str(e)}")
+            raise e
+
+    def build_from_files(self, file_paths, preprocessor, publish=True):
+        """
+        Build a snapshot from ingested CSV files (e.g. the train and test splits)
+
+        Args:
+            file_paths: CSV paths, read in order
+            preprocessor: Fitted preprocessor from DataTransformation
+            publish: See build()
+
+        Returns:
+            tuple: Number of machines in the snapshot and the snapshot name
+        """
+        columns = [ID_COLUMN] + NUMERIC_FEATURES + CATEGORICAL_FEATURES
+        df = pd.concat([load_csv(path, columns=columns) for path in file_paths],
+                       ignore_index=True)
+        return self.build(df, preprocessor, publish=publish)
+
+    def upsert(self, df, preprocessor):
+        """
+        Insert new machines and replace the rows of known ones
+
+        The rows are applied to a new current snapshot and journaled, so
+        later activations replay them with their own preprocessor.
+
+        Args:
+            df: DataFrame with Machine_ID and the raw feature columns
+            preprocessor: Fitted preprocessor of the model version that the
+                current snapshot belongs to (the active version)
+
+        Returns:
+            tuple: (updated, inserted) machine counts
+        """
+        try:
+            os.makedirs(self.config.store_dir, exist_ok=True)
+            self._append_journal(df)
+            if not self.load():
+                return 0, self.build(df, preprocessor)[0]
+
+            new_ids, new_features = self._transform(df, preprocessor)
+            merged_ids, merged_features, updated, inserted = self._merge(
+                self.ids, self.features, new_ids, new_features)
+            self._write_snapshot(merged_ids, merged_features, model_version=self.model_version)
+
+            return updated, inserted
+
+        except Exception as e:
+            logger.error(f"Error updating feature store: {str(e)}")
+            raise e
+
+if __name__ == "__main__":
+    store = FeatureStore()
+    if store.load():
+        print(f"Feature store snapshot {store.snapshot}: {len(store)} machines")
+    else:
+        print("No feature store found")
@@ -0,0 +1,371 @@
+"""
+Model Registry Component
+Immutable, versioned model artifacts with an atomically switched active version,
+and a live model holder that hot-swaps new versions into a running server
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+import joblib
+from dataclasses import dataclass
+from src.config import (NUMERIC_FEATURES, CATEGORICAL_FEATURES, TARGET_COLUMN,
+                        MAINTENANCE_TYPES)
+from src.components.feature_store import FeatureStore, FeatureStoreConfig
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+@dataclass
+class ModelRegistryConfig:
+    """Configuration for the model registry"""
+    registry_dir: str = os.path.join('models', 'registry')
+    # Fallback artifacts used when nothing has been registered yet; activation
+    # copies the active version's artifacts here
+    fallback_model_path: str = os.path.join('models', 'model.pkl')
+    fallback_preprocessor_path: str = os.path.join('models', 'preprocessor.pkl')
+    fallback_reference_profile_path: str = os.path.join('models', 'reference_profile.pkl')
+    feature_store_dir: str = os.path.join('models', 'feature_store')
+    # Newest versions kept when registering (the active one is always kept,
+    # 0 keeps every version); older ones and their snapshots are pruned
+    keep_versions: int = 5
+    poll_interval: float = 5.0
+    warmup_requests: int = 50
+
+def file_sha256(file_path):
+    """Hex SHA-256 of a file, read in blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ModelRegistry:
+    """
+    Local versioned registry
+
+    Each version is a read-only directory (v0001, v0002, ...) with
+    model.pkl, preprocessor.pkl, the drift reference_profile.pkl and
+    metadata.json, which also names the feature store snapshot built with
+    the version's preprocessor. Versions are staged in a temporary directory
+    and renamed into place, and the ACTIVE pointer is switched with
+    os.replace, so readers only ever see complete versions. Activating a
+    version publishes its files and feature store snapshot with it (with
+    the store's upserts replayed).
+    """
+
+    def __init__(self, config=None):
+        self.config = config or ModelRegistryConfig()
+        # Versions are immutable, so their metadata can be cached
+        self._metadata = {}
+
+    def _path(self, *parts):
+        return os.path.join(self.config.registry_dir, *parts)
+
+    def versions(self):
+        """Registered versions, oldest first"""
+        if not os.path.isdir(self.config.registry_dir):
+            return []
+        return sorted(name for name in os.listdir(self.config.registry_dir)
+                      if name.startswith('v') and name[1:].isdigit())
+
+    def metadata(self, version):
+        if version not in self._metadata:
+            with open(self._path(version, 'metadata.json')) as f:
+                self._metadata[version] = json.load(f)
+        return self._metadata[version]
+
+    def artifact_paths(self, version):
+        """
+        Returns:
+            tuple: Model and preprocessor paths of a version
+        """
+        return self._path(version, 'model.pkl'), self._path(version, 'preprocessor.pkl')
+
+    def active_version(self):
+        try:
+            with open(self._path('ACTIVE')) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _publish_artifacts(self, version):
+        """Copy a version's files to the fallback paths and publish its feature store snapshot"""
+        targets = (('model.pkl', self.config.fallback_model_path),
+                   ('preprocessor.pkl', self.config.fallback_preprocessor_path),
+                   ('reference_profile.pkl', self.config.fallback_reference_profile_path))
+        for name, target in targets:
+            source = self._path(version, name)
+            if not os.path.exists(source):
+                continue
+            os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+            target_tmp = f'{target}.{os.getpid()}.tmp'
+            shutil.copyfile(source, target_tmp)
+            os.replace(target_tmp, target)
+
+        snapshot = self.metadata(version).get('feature_store_snapshot')
+        if snapshot:
+            store = FeatureStore(FeatureStoreConfig(store_dir=self.config.feature_store_dir))
+            store.publish_version(snapshot, version, self._path(version, 'preprocessor.pkl'))
+
+    def activate(self, version):
+        """
+        Publish a registered version's artifacts and atomically point ACTIVE at it
+
+        Args:
+            version: Version to serve
+        """
+        if version not in self.versions():
+            raise ValueError(f"Unknown model version: {version}")
+        self._publish_artifacts(version)
+        pointer_tmp = self._path(f'ACTIVE.{os.getpid()}.tmp')
+        with open(pointer_tmp, 'w') as f:
+            f.write(version)
+        os.replace(pointer_tmp, self._path('ACTIVE'))
+        logger.info(f"Activated model version {version}")
+
+    def prune(self, keep=None):
+        """
+        Delete all but the newest versions and release the feature store
+        snapshots only they were using
+
+        Args:
+            keep: Number of newest versions to keep (defaults to
+                keep_versions); the active version is always kept
+
+        Returns:
+            list: Deleted versions
+        """
+        try:
+            keep = self.config.keep_versions if keep is None else keep
+            versions = self.versions()
+            kept = set(versions[-keep:] if keep > 0 else []) | {self.active_version()}
+            deleted = [version for version in versions if version not in kept]
+            for version in deleted:
+                shutil.rmtree(self._path(version))
+                self._metadata.pop(version, None)
+
+            if os.path.isdir(self.config.feature_store_dir):
+                snapshots = {self.metadata(version).get('feature_store_snapshot')
+                             for version in self.versions()}
+                store = FeatureStore(FeatureStoreConfig(store_dir=self.config.feature_store_dir))
+                released = store.release_pinned(snapshots - {None})
+                if released:
+                    logger.info(f"Released {len(released)} feature store snapshot(s)")
+
+            if deleted:
+                logger.info(f"Pruned model version(s) {', '.join(deleted)}")
+            return deleted
+
+        except Exception as e:
+            logger.error(f"Error pruning model registry: {str(e)}")
+            raise e
+
+    def register(self, model_path, preprocessor_path, metrics=None, activate=True,
+                 extra_metadata=None, reference_profile_path=None,
+                 feature_store_snapshot=None):
+        """
+        Copy artifacts into a new immutable version
+
+        Args:
+            model_path: Trained model file
+            preprocessor_path: Fitted preprocessor file
+            metrics: Evaluation metrics to record
+            activate: Make the new version active once it is in place
+            extra_metadata: Additional metadata fields
+            reference_profile_path: Drift reference profile of the training data
+            feature_store_snapshot: Pinned feature store snapshot built with
+                this preprocessor
+
+        Returns:
+            str: The new version
+        """
+        try:
+            os.makedirs(self.config.registry_dir, exist_ok=True)
+            staging_dir = self._path(f'.staging_{os.getpid()}_{time.time_ns()}')
+            os.makedirs(staging_dir)
+
+            artifacts = [(model_path, 'model.pkl'), (preprocessor_path, 'preprocessor.pkl')]
+            if reference_profile_path:
+                artifacts.append((reference_profile_path, 'reference_profile.pkl'))
+            for source, name in artifacts:
+                shutil.copy2(source, os.path.join(staging_dir, name))
+
+            model = joblib.load(os.path.join(staging_dir, 'model.pkl'))
+            metadata = {
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'model_class': type(model).__name__,
+                'metrics': metrics or {},
+                'feature_schema': {
+                    'numeric_features': NUMERIC_FEATURES,
+                    'categorical_features': CATEGORICAL_FEATURES,
+                    'target_column': TARGET_COLUMN,
+                    'n_features_in': int(getattr(model, 'n_features_in_', 0)) or None
+                },
+                'feature_store_snapshot': feature_store_snapshot,
+                'sha256': {
+                    name: file_sha256(os.path.join(staging_dir, name))
+                    for _, name in artifacts
+                },
+                **(extra_metadata or {})
+            }
+
+            # Claim the next version number; a concurrent writer makes rename fail
+            while True:
+                existing = self.versions()
+                version = f"v{int(existing[-1][1:]) + 1 if existing else 1:04d}"
+                metadata['version'] = version
+                with open(os.path.join(staging_dir, 'metadata.json'), 'w') as f:
+                    json.dump(metadata, f, indent=2, default=float)
+                try:
+                    os.rename(staging_dir, self._path(version))
+                    break
+                except OSError:
+                    if not os.path.exists(self._path(version)):
+                        raise
+
+            for name in os.listdir(self._path(version)):
+                os.chmod(self._path(version, name), 0o444)
+
+            logger.info(f"Registered model version {version} in {self.config.registry_dir}")
+
+            if activate:
+                self.activate(version)
+            if self.config.keep_versions > 0:
+                self.prune()
+
+            return version
+
+        except Exception as e:
+            logger.error(f"Error registering model: {str(e)}")
+            raise e
+
+def synthetic_requests(n_rows, seed=0):
+    """
+    Build plausible single-machine inputs for warming a model up
+
+    Args:
+        n_rows: Number of rows
+        seed: Random seed
+
+    Returns:
+        DataFrame: Input features in serving format
+    """
+    rng = np.random.default_rng(seed)
+    age = rng.uniform(1, 15, n_rows)
+    return pd.DataFrame({
+        'Age': age,
+        'Usage_Hours': age * rng.uniform(1000, 2500, n_rows),
+        'Maintenance_Type': rng.choice(MAINTENANCE_TYPES, n_rows),
+        'Last_Maintenance_Days': rng.integers(10, 365, n_rows),
+        'Part_Replacement': rng.integers(0, 2, n_rows),
+        'Technician_Experience': rng.uniform(1, 20, n_rows)
+    })
+
+class LiveModel:
+    """
+    Holds the model a server is using and swaps in new registry versions
+
+    The current (version, model, preprocessor) triple is one attribute, so
+    replacing it is atomic: requests that already took a reference finish on
+    the old model, later requests see the new one. New versions are loaded,
+    checked against their recorded hashes and warmed up on a background
+    thread before the swap, so no request pays the cold-load cost.
+    """
+
+    def __init__(self, registry=None):
+        self.registry = registry or ModelRegistry()
+        self.current = None
+        self._watcher = None
+        self._stop = threading.Event()
+
+    def _load(self, version):
+        """Load and warm up a version (None means the fallback artifacts)"""
+        if version is None:
+            model_path = self.registry.config.fallback_model_path
+            preprocessor_path = self.registry.config.fallback_preprocessor_path
+        else:
+            model_path, preprocessor_path = self.registry.artifact_paths(version)
+            expected = self.registry.metadata(version)['sha256']
+            for path, name in ((model_path, 'model.pkl'), (preprocessor_path, 'preprocessor.pkl')):
+                if file_sha256(path) != expected[name]:
+                    raise ValueError(f"Hash mismatch for {name} in version {version}")
+
+        model = joblib.load(model_path)
+        preprocessor = joblib.load(preprocessor_path)
+        self._warm_up(model, preprocessor)
+        return version, model, preprocessor
+
+    def _warm_up(self, model, preprocessor):
+        """Run synthetic requests so first real requests hit a hot model"""
+        n_rows = self.registry.config.warmup_requests
+        if n_rows <= 0:
+            return
+        requests = synthetic_requests(n_rows)
+        for i in range(min(n_rows, 10)):
+            model.predict(preprocessor.transform(requests.iloc[i:i + 1]))
+        model.predict(preprocessor.transform(requests))
+
+    def get(self):
+        """
+        Returns:
+            tuple: (version, model, preprocessor) currently being served
+        """
+        if self.current is None:
+            self.current = self._load(self.registry.active_version())
+        return self.current
+
+    def refresh(self):
+        """
+        Load the active version if it differs from the served one
+
+        Returns:
+            bool: True if a new version was swapped in
+        """
+        version = self.registry.active_version()
+        if self.current is not None and version == self.current[0]:
+            return False
+        loaded = self._load(version)
+        previous = self.current[0] if self.current else None
+        self.current = loaded
+        logger.info(f"Serving model version {version or 'fallback'} (was {previous or 'none'})")
+        return True
+
+    def _watch(self):
+        while not self._stop.wait(self.registry.config.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving the current model; retry on the next poll
+                logger.error(f"Error loading new model version: {str(e)}")
+
+    def start(self):
+        """Start polling the registry for newly activated versions"""
+        if self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, name='model-watcher',
+                                             daemon=True)
+            self._watcher.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+if __name__ == "__main__":
+    registry = ModelRegistry()
+    if len(sys.argv) == 3 and sys.argv[1] == 'activate':
+        # Promote a version, e.g. after shadow evaluation
+        registry.activate(sys.argv[2])
+    elif len(sys.argv) in (2, 3) and sys.argv[1] == 'prune':
+        # Keep the newest versions (default keep_versions) and the active one
+        registry.prune(int(sys.argv[2]) if len(sys.argv) == 3 else None)
+    active = registry.active_version()
+    for version in registry.versions():
+        metadata = registry.metadata(version)
+        marker = '*' if version == active else ' '
+        print(f"{marker} {version}  {metadata['created_at']}  {metadata['model_class']}  "
+              f"{metadata['metrics']}")
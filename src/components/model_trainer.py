@@ -4,19 +4,36 @@ Handles model training and evaluation
 """
 import os
 import sys
+import time
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from scipy import sparse
+from sklearn.ensemble import (RandomForestRegressor, GradientBoostingRegressor,
+                              HistGradientBoostingRegressor)
 from sklearn.linear_model import LinearRegression
 from sklearn.tree import DecisionTreeRegressor
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import joblib
+from src.components.model_registry import ModelRegistry
+from src.components.feature_binning import BinnedFeatureCache
+from src.logger import get_logger
+
+logger = get_logger(__name__)
 
 @dataclass
 class ModelTrainerConfig:
     """Configuration for model training"""
     trained_model_file_path: str = os.path.join('models', 'model.pkl')
+    # Register the best model as a new immutable version in the model registry
+    register_model: bool = True
+    # Make the new version active (servers pick it up without a restart)
+    activate_model: bool = True
+    # Also fit histogram gradient boosting on the binned feature cache (if the
+    # transformation stage built one for these features) and report it against
+    # the same model on float features; the binned fit is not a serving
+    # candidate, so this is an opt-in benchmark
+    use_binned_features: bool = False
 
 class ModelTrainer:
     """Handles model training and evaluation"""
@@ -42,10 +59,12 @@ class ModelTrainer:
             report = {}
             
             for model_name, model in models.items():
-                print(f"\nTraining {model_name}...")
+                logger.info(f"Training {model_name}...")
                 
                 # Train model
+                start = time.perf_counter()
                 model.fit(X_train, y_train)
+                fit_seconds = time.perf_counter() - start
                 
                 # Make predictions
                 y_train_pred = model.predict(X_train)
@@ -61,35 +80,83 @@ class ModelTrainer:
                     'train_r2': train_r2,
                     'test_r2': test_r2,
                     'test_mae': test_mae,
-                    'test_rmse': test_rmse
+                    'test_rmse': test_rmse,
+                    'fit_seconds': fit_seconds
                 }
                 
-                print(f"{model_name} - Train R²: {train_r2:.4f}, Test R²: {test_r2:.4f}")
-                print(f"{model_name} - MAE: {test_mae:.2f}, RMSE: {test_rmse:.2f}")
+                logger.info(f"{model_name} - Train R²: {train_r2:.4f}, Test R²: {test_r2:.4f}")
+                logger.info(f"{model_name} - MAE: {test_mae:.2f}, RMSE: {test_rmse:.2f}, "
+                            f"fit: {fit_seconds:.2f}s")
             
             return report
             
         except Exception as e:
-            print(f"Error evaluating models: {str(e)}")
+            logger.error(f"Error evaluating models: {str(e)}")
             raise e
     
-    def initiate_model_trainer(self, train_array, test_array):
+    def compare_binned_features(self, X_train, y_train, X_test, y_test, float_scores):
+        """
+        Fit histogram gradient boosting on the cached uint8 bins and report it
+        against the same model fitted on float features
+        
+        HistGradientBoostingRegressor bins its input itself, so the cache can
+        only save that binning step and memory; the comparison shows how much.
+        
+        Args:
+            X_train: Transformed training features
+            y_train: Training target
+            X_test: Transformed test features
+            y_test: Test target
+            float_scores: evaluate_models scores of the model on float features
+            
+        Returns:
+            dict: Scores of the binned fit, or None without a matching cache
+        """
+        load_start = time.perf_counter()
+        binned = BinnedFeatureCache().load(X_train, X_test)
+        load_seconds = time.perf_counter() - load_start
+        if binned is None:
+            logger.info("No binned feature cache for these features; skipping comparison")
+            return None
+        
+        X_train_binned, X_test_binned, _ = binned
+        model_name = "Hist Gradient Boosting (binned)"
+        binned_scores = self.evaluate_models(
+            X_train_binned, y_train, X_test_binned, y_test,
+            {model_name: HistGradientBoostingRegressor(random_state=42)}
+        )[model_name]
+        
+        float_bytes = X_train.data.nbytes if sparse.issparse(X_train) else X_train.nbytes
+        speedup = float_scores['fit_seconds'] / max(binned_scores['fit_seconds'], 1e-9)
+        logger.info(f"Binned vs float features (Hist Gradient Boosting): fit "
+                    f"{binned_scores['fit_seconds']:.2f}s vs {float_scores['fit_seconds']:.2f}s "
+                    f"({speedup:.2f}x, cache load {load_seconds:.2f}s), Test R² "
+                    f"{binned_scores['test_r2']:.4f} vs {float_scores['test_r2']:.4f}, "
+                    f"train features {X_train_binned.nbytes / 1024**2:.1f} MB vs "
+                    f"{float_bytes / 1024**2:.1f} MB")
+        return binned_scores
+    
+    def initiate_model_trainer(self, X_train, y_train, X_test, y_test,
+                               preprocessor_path=None, reference_profile_path=None,
+                               feature_store_snapshot=None):
         """
         Train and evaluate models
         
         Args:
-            train_array: Transformed training data
-            test_array: Transformed test data
+            X_train: Transformed training features (dense array or CSR matrix)
+            y_train: Training target
+            X_test: Transformed test features (dense array or CSR matrix)
+            y_test: Test target
+            preprocessor_path: Preprocessor the features were built with; when
+                given, the best model is registered together with it
+            reference_profile_path: Drift reference profile to register with the model
+            feature_store_snapshot: Feature store snapshot to register with the model
             
         Returns:
             float: Best model R² score
         """
         try:
-            print("Starting model training...")
-            
-            # Split features and target
-            X_train, y_train = train_array[:, :-1], train_array[:, -1]
-            X_test, y_test = test_array[:, :-1], test_array[:, -1]
+            logger.info("Starting model training...")
             
             # Define models to evaluate
             models = {
@@ -98,34 +165,54 @@ class ModelTrainer:
                 "Linear Regression": LinearRegression(),
                 "Decision Tree": DecisionTreeRegressor(random_state=42)
             }
+            # HistGradientBoostingRegressor only accepts dense input
+            if sparse.issparse(X_train):
+                logger.info("Sparse features: skipping Hist Gradient Boosting")
+            else:
+                models["Hist Gradient Boosting"] = HistGradientBoostingRegressor(random_state=42)
             
             # Evaluate all models
             model_report = self.evaluate_models(X_train, y_train, X_test, y_test, models)
             
+            if self.config.use_binned_features and "Hist Gradient Boosting" in model_report:
+                self.compare_binned_features(X_train, y_train, X_test, y_test,
+                                             model_report["Hist Gradient Boosting"])
+            
             # Get best model based on test R² score
             best_model_name = max(model_report, key=lambda x: model_report[x]['test_r2'])
             best_model_score = model_report[best_model_name]['test_r2']
             best_model = models[best_model_name]
             
-            print(f"\n{'='*50}")
-            print(f"Best Model: {best_model_name}")
-            print(f"Test R² Score: {best_model_score:.4f}")
-            print(f"{'='*50}")
+            logger.info(f"Best Model: {best_model_name}")
+            logger.info(f"Test R² Score: {best_model_score:.4f}")
             
             if best_model_score < 0.6:
-                print("Warning: Best model has R² score < 0.6")
+                logger.warning("Best model has R² score < 0.6")
             
-            # Save the best model
+            # Save the best model (write-then-rename, so readers never see a partial file)
             os.makedirs(os.path.dirname(self.config.trained_model_file_path), 
                        exist_ok=True)
-            joblib.dump(best_model, self.config.trained_model_file_path)
+            tmp_model_path = self.config.trained_model_file_path + '.tmp'
+            joblib.dump(best_model, tmp_model_path)
+            os.replace(tmp_model_path, self.config.trained_model_file_path)
+            
+            logger.info(f"Best model saved to {self.config.trained_model_file_path}")
             
-            print(f"Best model saved to {self.config.trained_model_file_path}")
+            if preprocessor_path and self.config.register_model:
+                ModelRegistry().register(
+                    self.config.trained_model_file_path,
+                    preprocessor_path,
+                    metrics=model_report[best_model_name],
+                    activate=self.config.activate_model,
+                    extra_metadata={'model_name': best_model_name},
+                    reference_profile_path=reference_profile_path,
+                    feature_store_snapshot=feature_store_snapshot
+                )
             
             return best_model_score
             
         except Exception as e:
-            print(f"Error during model training: {str(e)}")
+            logger.error(f"Error during model training: {str(e)}")
             raise e
 
 if __name__ == "__main__":
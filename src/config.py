@@ -17,6 +17,7 @@ TEST_DATA_PATH = os.path.join(DATA_DIR, 'test.csv')
 MODEL_DIR = os.path.join(BASE_DIR, 'models')
 MODEL_PATH = os.path.join(MODEL_DIR, 'model.pkl')
 PREPROCESSOR_PATH = os.path.join(MODEL_DIR, 'preprocessor.pkl')
+REFERENCE_PROFILE_PATH = os.path.join(MODEL_DIR, 'reference_profile.pkl')
 
 # Feature configuration
 NUMERIC_FEATURES = ['Age', 'Usage_Hours', 'Last_Maintenance_Days', 'Technician_Experience']
@@ -24,6 +25,18 @@ CATEGORICAL_FEATURES = ['Maintenance_Type', 'Part_Replacement']
 TARGET_COLUMN = 'Maintenance_Cost'
 ID_COLUMN = 'Machine_ID'
 
+# Compact dtypes used when loading data (see src.utils.load_csv)
+COLUMN_DTYPES = {
+    'Machine_ID': 'object',
+    'Age': 'float32',
+    'Usage_Hours': 'float32',
+    'Maintenance_Type': 'category',
+    'Last_Maintenance_Days': 'int16',
+    'Part_Replacement': 'int8',
+    'Technician_Experience': 'float32',
+    'Maintenance_Cost': 'float32'
+}
+
 # Model configuration
 RANDOM_STATE = 42
 TEST_SIZE = 0.2
@@ -40,3 +53,7 @@ FLASK_DEBUG = True
 # Logging configuration
 LOG_LEVEL = 'INFO'
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Records buffered for the background log writer; more are dropped and counted
+LOG_QUEUE_SIZE = 10000
+# Fraction of /predict requests written to the structured prediction log
+PREDICTION_LOG_SAMPLE_RATE = 0.01
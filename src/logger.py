@@ -1,9 +1,22 @@
 """
 Logging configuration for the maintenance cost prediction project
+
+Records are handed to a bounded in-memory queue on the calling thread and
+written by a background QueueListener, so hot paths never block on disk or
+console I/O. The log file is JSON lines; the console keeps the readable
+format. When the queue is full records are dropped and counted instead of
+blocking, and high-rate events can be sampled with extra={'sample_rate': r}.
 """
-import logging
 import os
+import json
+import queue
+import atexit
+import sys
+import random
+import logging
+import logging.handlers
 from datetime import datetime
+from src.config import LOG_LEVEL, LOG_FORMAT, LOG_QUEUE_SIZE
 
 # Create logs directory
 LOG_DIR = "logs"
@@ -13,22 +26,123 @@ os.makedirs(LOG_DIR, exist_ok=True)
 LOG_FILE = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
 LOG_FILE_PATH = os.path.join(LOG_DIR, LOG_FILE)
 
-# Configure logging
-logging.basicConfig(
-    filename=LOG_FILE_PATH,
-    format="[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO,
-)
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {
+    'message', 'asctime', 'sample_rate'
+}
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one compact JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 6),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str, separators=(',', ':'))
+
+class SamplingFilter(logging.Filter):
+    """Keeps a record with probability extra={'sample_rate': r} (default 1)"""
+
+    def __init__(self):
+        super().__init__()
+        self.sampled_out = 0
+
+    def filter(self, record):
+        rate = getattr(record, 'sample_rate', None)
+        if rate is None or rate >= 1 or random.random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking when full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+def _build_handlers():
+    file_handler = logging.FileHandler(LOG_FILE_PATH)
+    file_handler.setFormatter(JsonFormatter())
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    return file_handler, console_handler
+
+def _start_listener():
+    """Create a fresh queue and listener (also used in forked children)"""
+    global _listener
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    queue_handler.queue = log_queue
+    _listener = logging.handlers.QueueListener(log_queue, *_handlers,
+                                               respect_handler_level=True)
+    _listener.start()
+
+def stop_logging():
+    """Flush queued records and stop the background writer"""
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+def get_logger(name):
+    """
+    Get a logger that writes through the shared non-blocking queue
+
+    Args:
+        name: Logger name, usually __name__
+
+    Returns:
+        logging.Logger
+    """
+    return logging.getLogger(name)
+
+def logging_stats():
+    """
+    Returns:
+        dict: Records dropped on a full queue and sampled out, and queue depth
+    """
+    return {
+        'dropped': queue_handler.dropped,
+        'sampled_out': sampling_filter.sampled_out,
+        'queue_depth': queue_handler.queue.qsize()
+    }
+
+# Configure the root logger once, so library loggers (e.g. werkzeug) go
+# through the queue as well
+_handlers = _build_handlers()
+_listener = None
+sampling_filter = SamplingFilter()
+queue_handler = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+queue_handler.addFilter(sampling_filter)
+
+root_logger = logging.getLogger()
+root_logger.setLevel(LOG_LEVEL)
+root_logger.addHandler(queue_handler)
+
+_start_listener()
+atexit.register(stop_logging)
+if hasattr(os, 'register_at_fork'):
+    # The listener thread does not survive fork(); give children their own
+    os.register_at_fork(after_in_child=_start_listener)
 
 # Create logger
-logger = logging.getLogger(__name__)
-
-# Also log to console
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+logger = get_logger(__name__)
 
 if __name__ == "__main__":
     logger.info("Logging has started")
@@ -0,0 +1,339 @@
+"""
+Batch Scoring Pipeline
+Runs large scoring requests as asynchronous jobs with on-disk results
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import sqlite3
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from src.config import NUMERIC_FEATURES, CATEGORICAL_FEATURES, COLUMN_DTYPES
+from src.pipeline.predict_pipeline import PredictPipeline
+from src.components.model_registry import LiveModel
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+PREDICTION_COLUMN = 'Predicted_Maintenance_Cost'
+
+@dataclass
+class BatchJobConfig:
+    """Configuration for batch scoring jobs"""
+    jobs_dir: str = 'jobs'
+    db_path: str = os.path.join('jobs', 'jobs.db')
+    chunk_size: int = 10000
+    # Jobs running at once across every process sharing db_path (each web
+    # worker has its own pool, so the limit is enforced when a job is
+    # claimed); kept small so interactive /predict keeps its CPU
+    max_workers: int = 1
+    # Added to the worker processes' nice value
+    worker_niceness: int = 10
+
+class BatchJobStore:
+    """SQLite-backed job state, shared by the web process and the workers"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    input_path TEXT NOT NULL,
+                    result_path TEXT NOT NULL,
+                    total_rows INTEGER,
+                    rows_done INTEGER NOT NULL DEFAULT 0,
+                    bytes_done INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    worker_pid INTEGER,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def create(self, job_id, input_path, result_path):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, status, input_path, result_path, created_at, updated_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, input_path, result_path, now, now)
+            )
+
+    def update(self, job_id, **fields):
+        fields['updated_at'] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?",
+                         (*fields.values(), job_id))
+
+    def claim(self, pid, max_running=None, job_id=None):
+        """
+        Atomically take ownership of a queued job, or of a running job whose
+        worker process no longer exists (e.g. after a restart)
+
+        Args:
+            pid: Process id of the claiming worker
+            max_running: Refuse the claim while this many jobs are running
+                in live processes (across every process using this database)
+            job_id: Job to claim; None claims the oldest claimable job
+
+        Returns:
+            dict: The claimed job, or None if there is none or the limit is reached
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if job_id is None:
+                rows = conn.execute(
+                    "SELECT * FROM jobs WHERE status IN ('queued', 'running') ORDER BY created_at"
+                ).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchall()
+            running = conn.execute(
+                "SELECT worker_pid FROM jobs WHERE status = 'running'"
+            ).fetchall()
+            n_running = sum(1 for row in running if _pid_alive(row['worker_pid']))
+
+            job = None
+            if max_running is None or n_running < max_running:
+                job = next((row for row in rows if row['status'] == 'queued' or
+                            (row['status'] == 'running' and not _pid_alive(row['worker_pid']))),
+                           None)
+            if job is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', worker_pid = ?, updated_at = ? "
+                    "WHERE job_id = ?", (pid, time.time(), job['job_id'])
+                )
+            conn.commit()
+            return dict(job) if job is not None else None
+        finally:
+            conn.close()
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def unfinished(self):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT job_id FROM jobs WHERE status IN ('queued', 'running') ORDER BY created_at"
+            ).fetchall()
+        return [row['job_id'] for row in rows]
+
+def _pid_alive(pid):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+# Per-process pipeline, so each worker unpickles the artifacts only once
+_worker_pipeline = None
+
+def _init_worker(niceness):
+    global _worker_pipeline
+    if niceness and hasattr(os, 'nice'):
+        os.nice(niceness)
+    _worker_pipeline = PredictPipeline(live_model=LiveModel())
+
+def run_batch_job(config, job_id):
+    """
+    Claim and score a job, then keep claiming queued jobs until none is left
+
+    At most config.max_workers jobs run at once across all processes: a
+    claim beyond the limit is refused and the job stays queued, to be picked
+    up by whichever worker finishes its current job first.
+
+    Args:
+        config: BatchJobConfig
+        job_id: Job identifier
+    """
+    store = BatchJobStore(config.db_path)
+    job = store.claim(os.getpid(), config.max_workers, job_id=job_id)
+    if job is None:
+        return
+
+    pipeline = _worker_pipeline or PredictPipeline(live_model=LiveModel())
+    while job is not None:
+        _score_job(config, store, pipeline, job)
+        job = store.claim(os.getpid(), config.max_workers)
+
+def _score_job(config, store, pipeline, job):
+    """
+    Score one claimed job in chunks, appending each chunk to the result file
+
+    Progress is committed after every chunk as (rows_done, bytes_done), so a
+    job interrupted by a restart resumes after its last committed chunk.
+
+    Args:
+        config: BatchJobConfig
+        store: BatchJobStore
+        pipeline: PredictPipeline backed by a LiveModel
+        job: Claimed job row
+    """
+    job_id = job['job_id']
+    # Score the whole job with the version that is active when it starts
+    pipeline.live_model.refresh()
+    feature_columns = NUMERIC_FEATURES + CATEGORICAL_FEATURES
+    dtype = {col: COLUMN_DTYPES[col] for col in feature_columns}
+
+    try:
+        rows_done = job['rows_done']
+        bytes_done = job['bytes_done']
+
+        # Drop any partially written chunk from an interrupted run
+        with open(job['result_path'], 'ab') as result_file:
+            result_file.truncate(bytes_done)
+
+        reader = pd.read_csv(job['input_path'], chunksize=config.chunk_size, dtype=dtype)
+        rows_seen = 0
+        for chunk in reader:
+            rows_seen += len(chunk)
+            if rows_seen <= rows_done:
+                continue
+
+            missing_columns = set(feature_columns) - set(chunk.columns)
+            if missing_columns:
+                raise ValueError(f"Missing columns: {sorted(missing_columns)}")
+
+            chunk[PREDICTION_COLUMN] = pipeline.predict(chunk[feature_columns])
+
+            with open(job['result_path'], 'a', newline='') as result_file:
+                chunk.to_csv(result_file, index=False, header=(bytes_done == 0))
+                bytes_done = result_file.tell()
+            rows_done = rows_seen
+            store.update(job_id, rows_done=rows_done, bytes_done=bytes_done)
+
+        store.update(job_id, status='completed', total_rows=rows_done)
+
+    except Exception as e:
+        logger.error(f"Error in batch job {job_id}: {str(e)}")
+        store.update(job_id, status='failed', error=str(e))
+
+class BatchScoringService:
+    """Accepts scoring jobs and runs them on a small local worker pool"""
+
+    def __init__(self, config=None):
+        self.config = config or BatchJobConfig()
+        self.store = BatchJobStore(self.config.db_path)
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.config.max_workers,
+                initializer=_init_worker,
+                initargs=(self.config.worker_niceness,)
+            )
+        return self._executor
+
+    def start(self):
+        """
+        Re-queue jobs left queued or running by a previous process
+
+        Returns:
+            int: Number of resumed jobs
+        """
+        job_ids = self.store.unfinished()
+        for job_id in job_ids:
+            self._pool().submit(run_batch_job, self.config, job_id)
+        if job_ids:
+            logger.info(f"Resumed {len(job_ids)} batch job(s)")
+        return len(job_ids)
+
+    def submit(self, write_input):
+        """
+        Create a job and queue it for scoring
+
+        Args:
+            write_input: Callable that writes the input CSV to the given path
+
+        Returns:
+            str: Job identifier
+        """
+        job_id = uuid.uuid4().hex
+        job_dir = os.path.join(self.config.jobs_dir, job_id)
+        os.makedirs(job_dir, exist_ok=True)
+
+        input_path = os.path.join(job_dir, 'input.csv')
+        result_path = os.path.join(job_dir, 'results.csv')
+        write_input(input_path)
+
+        self.store.create(job_id, input_path, result_path)
+        self._pool().submit(run_batch_job, self.config, job_id)
+
+        return job_id
+
+    def submit_csv(self, file_obj):
+        """Queue a job from an uploaded CSV file object"""
+        def write_input(path):
+            with open(path, 'wb') as out:
+                while True:
+                    block = file_obj.read(1024 * 1024)
+                    if not block:
+                        break
+                    out.write(block)
+        return self.submit(write_input)
+
+    def submit_records(self, records):
+        """Queue a job from a list of JSON records"""
+        return self.submit(lambda path: pd.DataFrame.from_records(records).to_csv(path, index=False))
+
+    def status(self, job_id):
+        """
+        Get the public state of a job
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            dict: Job state, or None for unknown jobs
+        """
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        return {
+            'job_id': job['job_id'],
+            'status': job['status'],
+            'rows_done': job['rows_done'],
+            'total_rows': job['total_rows'],
+            'error': job['error'],
+            'created_at': job['created_at'],
+            'updated_at': job['updated_at']
+        }
+
+    def result_path(self, job_id):
+        """Path of a completed job's result CSV, or None"""
+        job = self.store.get(job_id)
+        if job is None or job['status'] != 'completed':
+            return None
+        return job['result_path']
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+if __name__ == "__main__":
+    service = BatchScoringService()
+    with open(sys.argv[1], 'rb') as file_obj:
+        job_id = service.submit_csv(file_obj)
+    print(f"Submitted job {job_id}")
+    while service.status(job_id)['status'] in ('queued', 'running'):
+        time.sleep(1)
+    print(json.dumps(service.status(job_id), indent=2))
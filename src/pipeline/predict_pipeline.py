@@ -6,13 +6,40 @@ import os
 import sys
 import pandas as pd
 import joblib
+from src.logger import get_logger
+
+logger = get_logger(__name__)
 
 class PredictPipeline:
     """Prediction pipeline for new data"""
     
-    def __init__(self):
+    def __init__(self, live_model=None):
+        """
+        Args:
+            live_model: Optional LiveModel serving the active registry version;
+                without it the fixed model and preprocessor paths are used
+        """
         self.model_path = os.path.join('models', 'model.pkl')
         self.preprocessor_path = os.path.join('models', 'preprocessor.pkl')
+        self.live_model = live_model
+        self.model = None
+        self.preprocessor = None
+    
+    def load_artifacts(self):
+        """
+        Load the model and preprocessor once and keep them for later calls
+        
+        Returns:
+            tuple: Model and preprocessor
+        """
+        if self.live_model is not None:
+            # One consistent pair per call, even while a new version is swapped in
+            _, model, preprocessor = self.live_model.get()
+            return model, preprocessor
+        if self.model is None or self.preprocessor is None:
+            self.model = joblib.load(self.model_path)
+            self.preprocessor = joblib.load(self.preprocessor_path)
+        return self.model, self.preprocessor
     
     def predict(self, features):
         """
@@ -26,8 +53,7 @@ class PredictPipeline:
         """
         try:
             # Load model and preprocessor
-            model = joblib.load(self.model_path)
-            preprocessor = joblib.load(self.preprocessor_path)
+            model, preprocessor = self.load_artifacts()
             
             # Transform features
             data_scaled = preprocessor.transform(features)
@@ -38,7 +64,7 @@ class PredictPipeline:
             return predictions
             
         except Exception as e:
-            print(f"Error during prediction: {str(e)}")
+            logger.error(f"Error during prediction: {str(e)}")
             raise e
 
 class CustomData:
@@ -79,7 +105,7 @@ class CustomData:
             return pd.DataFrame(custom_data_input_dict)
             
         except Exception as e:
-            print(f"Error creating dataframe: {str(e)}")
+            logger.error(f"Error creating dataframe: {str(e)}")
             raise e
 
 if __name__ == "__main__":
@@ -0,0 +1,263 @@
+"""
+Shadow Evaluation Pipeline
+Scores a sample of live requests with a candidate model off the request path
+"""
+import os
+import sys
+import time
+import queue
+import random
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+import joblib
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+# One fixed-size record per shadowed request
+SHADOW_RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('primary', '<f4'),
+    ('shadow', '<f4'),
+    ('primary_ms', '<f4'),
+    ('shadow_ms', '<f4')
+])
+
+@dataclass
+class ShadowConfig:
+    """Configuration for shadow evaluation"""
+    # Registry version to evaluate; None picks the newest version registered
+    # after the active one (e.g. by --no-promote), or no candidate
+    candidate_version: Optional[str] = None
+    sample_rate: float = 0.2
+    queue_size: int = 256
+    # Skip shadow work while more primary requests than this are in flight
+    max_inflight_requests: int = 4
+    log_path: str = os.path.join('logs', 'shadow.bin')
+    window: int = 10000
+    candidate_poll_interval: float = 30.0
+    flush_interval: float = 1.0
+
+def read_shadow_log(log_path):
+    """
+    Load a shadow log as a structured array
+
+    Args:
+        log_path: Path written by ShadowEvaluator
+
+    Returns:
+        ndarray: Records with timestamp, primary, shadow, primary_ms, shadow_ms
+    """
+    return np.fromfile(log_path, dtype=SHADOW_RECORD_DTYPE)
+
+class ShadowEvaluator:
+    """
+    Runs a candidate model next to the served one without adding request latency
+
+    The request thread only samples and enqueues (non-blocking); a single
+    background thread scores the candidate, appends a fixed-size binary
+    record to the log and keeps rolling windows for comparisons. Shadow work
+    is dropped first: when too many primary requests are in flight or the
+    queue is full, the sample is discarded and counted.
+    """
+
+    def __init__(self, live_model, config=None, registry=None):
+        self.live_model = live_model
+        self.config = config or ShadowConfig()
+        self.registry = registry or live_model.registry
+        self.candidate = None
+        self._queue = queue.Queue(maxsize=self.config.queue_size)
+        self._inflight = 0
+        self._inflight_lock = threading.Lock()
+        self._worker = None
+        self._stop = threading.Event()
+        self._next_candidate_check = 0.0
+
+        self.submitted = 0
+        self.skipped_no_candidate = 0
+        self.dropped_load = 0
+        self.dropped_queue = 0
+        self.scored = 0
+        self.errors = 0
+        self._diffs = deque(maxlen=self.config.window)
+        self._primary_ms = deque(maxlen=self.config.window)
+        self._shadow_ms = deque(maxlen=self.config.window)
+
+    @contextmanager
+    def track(self):
+        """Count a primary request as in flight, for load shedding"""
+        with self._inflight_lock:
+            self._inflight += 1
+        try:
+            yield
+        finally:
+            with self._inflight_lock:
+                self._inflight -= 1
+
+    def submit(self, features, primary_predictions, primary_seconds):
+        """
+        Offer a scored request for shadow evaluation (never blocks)
+
+        Args:
+            features: Raw input DataFrame of the request
+            primary_predictions: Predictions returned to the client
+            primary_seconds: Latency of the primary prediction (preprocessing
+                and model call, the same work timed for the candidate)
+        """
+        if self._worker is None or random.random() >= self.config.sample_rate:
+            return
+        if self.candidate is None:
+            self.skipped_no_candidate += 1
+            return
+        if self._inflight > self.config.max_inflight_requests:
+            self.dropped_load += 1
+            return
+        try:
+            self._queue.put_nowait((time.time(), features, primary_predictions, primary_seconds))
+            self.submitted += 1
+        except queue.Full:
+            self.dropped_queue += 1
+
+    def _resolve_candidate(self):
+        """(Re)load the candidate model when the configured or newest unpromoted version changes"""
+        now = time.monotonic()
+        if now < self._next_candidate_check:
+            return
+        self._next_candidate_check = now + self.config.candidate_poll_interval
+
+        version = self.config.candidate_version
+        if version is None:
+            # Only versions registered after the active one; older ones are
+            # superseded models (rollback targets), not candidates
+            active = self.registry.active_version()
+            newer = [v for v in self.registry.versions() if active is None or v > active]
+            version = newer[-1] if newer else None
+
+        if version is None:
+            self.candidate = None
+        elif self.candidate is None or self.candidate[0] != version:
+            model_path, preprocessor_path = self.registry.artifact_paths(version)
+            self.candidate = (version, joblib.load(model_path), joblib.load(preprocessor_path))
+            logger.info(f"Shadow evaluation candidate: model version {version}")
+
+    def _run(self):
+        os.makedirs(os.path.dirname(self.config.log_path) or '.', exist_ok=True)
+        with open(self.config.log_path, 'ab') as log_file:
+            last_flush = time.monotonic()
+            while not self._stop.is_set():
+                try:
+                    # Also picks up a candidate while no samples are accepted
+                    self._resolve_candidate()
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"Error loading shadow candidate: {str(e)}")
+
+                try:
+                    item = self._queue.get(timeout=self.config.flush_interval)
+                except queue.Empty:
+                    item = None
+
+                if item is not None:
+                    try:
+                        self._score(item, log_file)
+                    except Exception as e:
+                        self.errors += 1
+                        logger.error(f"Error in shadow evaluation: {str(e)}")
+
+                if time.monotonic() - last_flush >= self.config.flush_interval:
+                    log_file.flush()
+                    last_flush = time.monotonic()
+
+    def _score(self, item, log_file):
+        timestamp, features, primary_predictions, primary_seconds = item
+        if self.candidate is None:
+            # The candidate went away after the sample was queued
+            self.skipped_no_candidate += 1
+            return
+
+        _, model, preprocessor = self.candidate
+        start = time.perf_counter()
+        shadow_predictions = model.predict(preprocessor.transform(features))
+        shadow_seconds = time.perf_counter() - start
+
+        primary_predictions = np.asarray(primary_predictions, dtype=np.float64)
+        records = np.empty(len(primary_predictions), dtype=SHADOW_RECORD_DTYPE)
+        records['timestamp'] = timestamp
+        records['primary'] = primary_predictions
+        records['shadow'] = shadow_predictions
+        records['primary_ms'] = primary_seconds * 1000
+        records['shadow_ms'] = shadow_seconds * 1000
+        log_file.write(records.tobytes())
+
+        self._diffs.extend((shadow_predictions - primary_predictions).tolist())
+        self._primary_ms.append(primary_seconds * 1000)
+        self._shadow_ms.append(shadow_seconds * 1000)
+        self.scored += 1
+
+    def start(self):
+        """Start the background shadow worker"""
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name='shadow-evaluator',
+                                            daemon=True)
+            self._worker.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def report(self):
+        """
+        Rolling comparison of the candidate against the served model
+
+        Returns:
+            dict: Sampling counters, difference distribution, MAE between the
+                models and latency of each
+        """
+        # list() copies each window in one step while the worker keeps appending
+        diffs = np.array(list(self._diffs))
+        primary_ms = np.array(list(self._primary_ms))
+        shadow_ms = np.array(list(self._shadow_ms))
+
+        def percentiles(values):
+            if len(values) == 0:
+                return None
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99)}
+
+        report = {
+            'primary_version': (self.live_model.current[0] if self.live_model.current else None),
+            'candidate_version': self.candidate[0] if self.candidate else None,
+            'sample_rate': self.config.sample_rate,
+            'submitted': self.submitted,
+            'skipped_no_candidate': self.skipped_no_candidate,
+            'scored': self.scored,
+            'dropped_load': self.dropped_load,
+            'dropped_queue': self.dropped_queue,
+            'errors': self.errors,
+            'queue_depth': self._queue.qsize(),
+            'window': len(diffs),
+            'mae_between_models': float(np.abs(diffs).mean()) if len(diffs) else None,
+            'mean_difference': float(diffs.mean()) if len(diffs) else None,
+            'difference': None,
+            'primary_latency_ms': percentiles(primary_ms),
+            'shadow_latency_ms': percentiles(shadow_ms)
+        }
+        if len(diffs):
+            p5, p50, p95 = np.percentile(diffs, [5, 50, 95])
+            report['difference'] = {'p5': float(p5), 'p50': float(p50), 'p95': float(p95),
+                                    'max_abs': float(np.abs(diffs).max())}
+        return report
+
+if __name__ == "__main__":
+    # Summarise an existing shadow log
+    records = read_shadow_log(sys.argv[1] if len(sys.argv) > 1 else ShadowConfig().log_path)
+    diffs = records['shadow'].astype(np.float64) - records['primary']
+    print(f"{len(records)} shadowed predictions")
+    if len(records):
+        print(f"MAE between models: {np.abs(diffs).mean():.2f}")
+        print(f"Primary latency p50: {np.median(records['primary_ms']):.2f} ms, "
+              f"shadow latency p50: {np.median(records['shadow_ms']):.2f} ms")
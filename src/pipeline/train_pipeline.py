@@ -4,9 +4,16 @@ Orchestrates the complete training workflow
 """
 import os
 import sys
+import shutil
+import tempfile
+import joblib
 from src.components.data_ingestion import DataIngestion
 from src.components.data_transformation import DataTransformation
+from src.components.feature_store import FeatureStore
 from src.components.model_trainer import ModelTrainer
+from src.logger import get_logger
+
+logger = get_logger(__name__)
 
 class TrainPipeline:
     """Complete training pipeline"""
@@ -14,49 +21,84 @@ class TrainPipeline:
     def __init__(self):
         pass
     
-    def run_pipeline(self):
+    def run_pipeline(self, promote=True):
         """
         Execute the complete training pipeline
         
+        Args:
+            promote: Activate the new model version; with False it is only
+                registered, so it can be shadow-evaluated before promotion.
+                Its artifacts are then written to a staging directory and
+                only copied into the registry version, so the served model
+                files, drift profile and feature store stay untouched until
+                the version is activated
+        
         Returns:
             float: Model performance score
         """
+        staging_dir = None
         try:
-            print("="*60)
-            print("STARTING TRAINING PIPELINE")
-            print("="*60)
+            logger.info("STARTING TRAINING PIPELINE")
+            if not promote:
+                os.makedirs('models', exist_ok=True)
+                staging_dir = tempfile.mkdtemp(prefix='.candidate_', dir='models')
             
             # Step 1: Data Ingestion
-            print("\n[STEP 1/3] Data Ingestion")
-            print("-"*60)
+            logger.info("[STEP 1/3] Data Ingestion")
             data_ingestion = DataIngestion()
             train_data_path, test_data_path = data_ingestion.initiate_data_ingestion()
             
             # Step 2: Data Transformation
-            print("\n[STEP 2/3] Data Transformation")
-            print("-"*60)
+            logger.info("[STEP 2/3] Data Transformation")
             data_transformation = DataTransformation()
-            train_arr, test_arr, _ = data_transformation.initiate_data_transformation(
-                train_data_path, test_data_path
+            if staging_dir:
+                data_transformation.config.preprocessor_obj_file_path = os.path.join(
+                    staging_dir, 'preprocessor.pkl')
+                data_transformation.config.reference_profile_file_path = os.path.join(
+                    staging_dir, 'reference_profile.pkl')
+            X_train, y_train, X_test, y_test, preprocessor_path = (
+                data_transformation.initiate_data_transformation(
+                    train_data_path, test_data_path
+                )
+            )
+            
+            # Index every ingested machine's transformed features for predict-by-ID;
+            # the snapshot is published when the model version using it is activated
+            feature_store = FeatureStore()
+            n_machines, snapshot = feature_store.build_from_files(
+                [train_data_path, test_data_path], joblib.load(preprocessor_path),
+                publish=False
             )
+            logger.info(f"Feature store snapshot {snapshot} built for {n_machines} machines "
+                        f"in {feature_store.config.store_dir}")
             
             # Step 3: Model Training
-            print("\n[STEP 3/3] Model Training")
-            print("-"*60)
+            logger.info("[STEP 3/3] Model Training")
             model_trainer = ModelTrainer()
-            score = model_trainer.initiate_model_trainer(train_arr, test_arr)
+            model_trainer.config.activate_model = promote
+            if staging_dir:
+                model_trainer.config.trained_model_file_path = os.path.join(
+                    staging_dir, 'model.pkl')
+            score = model_trainer.initiate_model_trainer(
+                X_train, y_train, X_test, y_test, preprocessor_path=preprocessor_path,
+                reference_profile_path=data_transformation.config.reference_profile_file_path,
+                feature_store_snapshot=snapshot
+            )
             
-            print("\n" + "="*60)
-            print("TRAINING PIPELINE COMPLETED SUCCESSFULLY")
-            print(f"Final Model R² Score: {score:.4f}")
-            print("="*60)
+            logger.info("TRAINING PIPELINE COMPLETED SUCCESSFULLY")
+            logger.info(f"Final Model R² Score: {score:.4f}")
             
             return score
             
         except Exception as e:
-            print(f"\nERROR IN TRAINING PIPELINE: {str(e)}")
+            logger.error(f"ERROR IN TRAINING PIPELINE: {str(e)}")
             raise e
+            
+        finally:
+            # The registry keeps its own copies of the candidate's artifacts
+            if staging_dir:
+                shutil.rmtree(staging_dir, ignore_errors=True)
 
 if __name__ == "__main__":
     pipeline = TrainPipeline()
-    pipeline.run_pipeline()
+    pipeline.run_pipeline(promote='--no-promote' not in sys.argv)
@@ -6,7 +6,8 @@ import sys
 import joblib
 import pandas as pd
 import numpy as np
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+from src.config import COLUMN_DTYPES
 
 def save_object(file_path: str, obj: Any) -> None:
     """
@@ -43,6 +44,74 @@ def load_object(file_path: str) -> Any:
     except Exception as e:
         raise Exception(f"Error loading object: {str(e)}")
 
+def load_csv(file_path: str, columns: Optional[List[str]] = None,
+             chunksize: Optional[int] = None) -> pd.DataFrame:
+    """
+    Read a CSV using the compact dtype schema from src.config
+    
+    Args:
+        file_path: Path to the CSV file
+        columns: Columns to read; all other columns are skipped while parsing
+        chunksize: If set, return an iterator of DataFrames of this many rows
+        
+    Returns:
+        DataFrame with categorical, int8/int16 and float32 columns (or an
+        iterator of them when chunksize is set)
+    """
+    try:
+        wanted = columns if columns is not None else list(COLUMN_DTYPES)
+        dtype = {col: COLUMN_DTYPES[col] for col in wanted if col in COLUMN_DTYPES}
+        
+        return pd.read_csv(file_path, usecols=columns, dtype=dtype, chunksize=chunksize)
+        
+    except Exception as e:
+        raise Exception(f"Error loading {file_path}: {str(e)}")
+
+def memory_report(df: pd.DataFrame) -> Tuple[int, int]:
+    """
+    Measure a DataFrame's memory against the inferred-dtype equivalent
+    
+    Args:
+        df: DataFrame loaded with compact dtypes
+        
+    Returns:
+        Tuple of (compact_bytes, inferred_bytes), where inferred_bytes
+        estimates the same frame with object/int64/float64 columns
+    """
+    compact_bytes = int(df.memory_usage(index=False, deep=True).sum())
+    inferred_bytes = 0
+    
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Object column: one pointer per row plus a str object per row
+            codes = series.cat.codes.to_numpy()
+            sizes = np.array([sys.getsizeof(c) for c in series.cat.categories])
+            inferred_bytes += 8 * len(series) + int(sizes[codes[codes >= 0]].sum())
+        elif series.dtype == object:
+            inferred_bytes += int(series.memory_usage(index=False, deep=True))
+        else:
+            inferred_bytes += 8 * len(series)
+    
+    return compact_bytes, inferred_bytes
+
+def format_memory_report(stage: str, df: pd.DataFrame) -> str:
+    """
+    Describe the memory saved by compact dtypes for a pipeline stage
+    
+    Args:
+        stage: Name of the stage that loaded the frame
+        df: DataFrame loaded with compact dtypes
+        
+    Returns:
+        One-line summary
+    """
+    compact_bytes, inferred_bytes = memory_report(df)
+    saved = 1 - compact_bytes / inferred_bytes if inferred_bytes else 0.0
+    
+    return (f"{stage}: {compact_bytes / 1024**2:.2f} MB "
+            f"(inferred dtypes: {inferred_bytes / 1024**2:.2f} MB, saved {saved:.0%})")
+
 def evaluate_model(X_train: np.ndarray, y_train: np.ndarray,
                    X_test: np.ndarray, y_test: np.ndarray,
                    models: Dict[str, Any]) -> Dict[str, float]:
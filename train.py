@@ -2,37 +2,46 @@ import pandas as pd
 import numpy as np
 import joblib
 import os
+import tempfile
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from src.config import NUMERIC_FEATURES, CATEGORICAL_FEATURES, TARGET_COLUMN, ID_COLUMN
+from src.utils import load_csv, format_memory_report
+from src.components.drift_monitor import build_reference_profile
+from src.components.feature_store import FeatureStore
+from src.components.model_registry import ModelRegistry
+from src.logger import get_logger
+
+logger = get_logger(__name__)
 
 def train_model():
     """
     Trains the maintenance cost prediction model.
     Loads data, preprocesses features, trains a Random Forest Regressor,
-    evaluates performance, and saves the model.
+    evaluates performance, saves the model and registers it as the
+    active model version served by app.py.
     """
-    # Load data
-    df = pd.read_csv('data/maintenance_data.csv')
+    # Load data (IDs, features and target only, compact dtypes)
+    df = load_csv('data/maintenance_data.csv',
+                  columns=[ID_COLUMN] + NUMERIC_FEATURES + CATEGORICAL_FEATURES + [TARGET_COLUMN])
+    logger.info(format_memory_report("Loaded data", df))
     
     # Define features and target
-    X = df.drop(['Machine_ID', 'Maintenance_Cost'], axis=1)
-    y = df['Maintenance_Cost']
+    X = df.drop(columns=[TARGET_COLUMN, ID_COLUMN])
+    y = df[TARGET_COLUMN]
     
     # Split data
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
     
     # Preprocessing
-    numeric_features = ['Age', 'Usage_Hours', 'Last_Maintenance_Days', 'Technician_Experience']
-    categorical_features = ['Maintenance_Type', 'Part_Replacement']
-    
     preprocessor = ColumnTransformer(
         transformers=[
-            ('num', StandardScaler(), numeric_features),
-            ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_features)
+            ('num', StandardScaler(), NUMERIC_FEATURES),
+            ('cat', OneHotEncoder(handle_unknown='ignore'), CATEGORICAL_FEATURES)
         ])
     
     # Create pipeline
@@ -42,7 +51,7 @@ def train_model():
     ])
     
     # Train model
-    print("Training model...")
+    logger.info("Training model...")
     model.fit(X_train, y_train)
     
     # Evaluate
@@ -51,15 +60,35 @@ def train_model():
     mse = mean_squared_error(y_test, y_pred)
     r2 = r2_score(y_test, y_pred)
     
-    print(f"Model Evaluation:")
-    print(f"MAE: {mae:.2f}")
-    print(f"MSE: {mse:.2f}")
-    print(f"R2 Score: {r2:.4f}")
+    logger.info(f"Model Evaluation - MAE: {mae:.2f}, MSE: {mse:.2f}, R2 Score: {r2:.4f}")
     
     # Save model
     os.makedirs('models', exist_ok=True)
     joblib.dump(model, 'models/maintenance_model.joblib')
-    print("Model saved to models/maintenance_model.joblib")
+    logger.info("Model saved to models/maintenance_model.joblib")
+    
+    # Register the fitted preprocessor and regressor, with the drift reference
+    # profile and a feature store snapshot, and make them the served version
+    fitted_preprocessor = model.named_steps['preprocessor']
+    with tempfile.TemporaryDirectory() as staging_dir:
+        model_path = os.path.join(staging_dir, 'model.pkl')
+        preprocessor_path = os.path.join(staging_dir, 'preprocessor.pkl')
+        reference_profile_path = os.path.join(staging_dir, 'reference_profile.pkl')
+        joblib.dump(model.named_steps['regressor'], model_path)
+        joblib.dump(fitted_preprocessor, preprocessor_path)
+        joblib.dump(build_reference_profile(df, NUMERIC_FEATURES, CATEGORICAL_FEATURES,
+                                            TARGET_COLUMN), reference_profile_path)
+        _, snapshot = FeatureStore().build(df, fitted_preprocessor, publish=False)
+        
+        ModelRegistry().register(
+            model_path,
+            preprocessor_path,
+            metrics={'test_r2': r2, 'test_mae': mae, 'test_rmse': float(np.sqrt(mse))},
+            activate=True,
+            extra_metadata={'model_name': 'Random Forest (train.py)'},
+            reference_profile_path=reference_profile_path,
+            feature_store_snapshot=snapshot
+        )
 
 if __name__ == "__main__":
     train_model()